@@ -12,6 +12,16 @@ class Settings(BaseSettings):
     main_admin_id: int | None = None
     reengage_after_hours: int = 72
     reengage_check_interval_min: int = 360
+    match_on_enqueue: bool = True
+    match_batch_interval_sec: int = 30
+    pair_cooldown_store: str = "memory"
+    pair_cooldown_sec: int = 1800
+    games_similarity: str = "lcs"
+    games_search_workers: int = 4
+    games_search_cache_size: int = 256
+    games_snapshot: bool = True
+    games_readonly: bool = False
+    games_refresh_interval_sec: float = 2.0
 
     @property
     def admin_id_set(self) -> set[int]:
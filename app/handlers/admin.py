@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 
 from aiogram import F, Router
@@ -232,7 +233,8 @@ async def games_cmd(message: Message) -> None:
     if not games or total == 0:
         await message.answer("Список игр пуст.")
         return
-    lines = [f"- {g['code']}: {games_service.label(str(g['code']), 'ru')} / {g['name_en']}" for g in games]
+    codes = [str(g['code']) for g in games]
+    lines = [f"- {code}: {label} / {g['name_en']}" for code, label, g in zip(codes, games_service.labels(codes, 'ru'), games)]
     lines.append(f"\nПоказано: {len(games)} из {total}.")
     lines.append("\nДобавить: /games_add &lt;code&gt; &lt;name_ru&gt; | &lt;name_en&gt;")
     lines.append("Удалить: /games_remove &lt;code&gt;")
@@ -243,13 +245,16 @@ async def games_cmd(message: Message) -> None:
 async def games_add_cmd(message: Message) -> None:
     if not _is_admin(message.from_user.id):
         return
+    if games_service.readonly:
+        await message.answer("Каталог игр в этом процессе открыт только для чтения; измени его в основном боте.")
+        return
     raw = (message.text or "").split(maxsplit=2)
     if len(raw) < 3 or "|" not in raw[2]:
         await message.answer("Использование: /games_add &lt;code&gt; &lt;name_ru&gt; | &lt;name_en&gt;")
         return
     code = raw[1]
     name_ru, name_en = [p.strip() for p in raw[2].split("|", 1)]
-    games_service.add(code, name_ru, name_en)
+    await asyncio.to_thread(games_service.add, code, name_ru, name_en)
     await message.answer("Добавлено.")
 
 
@@ -257,12 +262,15 @@ async def games_add_cmd(message: Message) -> None:
 async def games_remove_cmd(message: Message) -> None:
     if not _is_admin(message.from_user.id):
         return
+    if games_service.readonly:
+        await message.answer("Каталог игр в этом процессе открыт только для чтения; измени его в основном боте.")
+        return
     raw = (message.text or "").split(maxsplit=1)
     if len(raw) < 2:
         await message.answer("Использование: /games_remove &lt;code&gt;")
         return
     code = raw[1].strip()
-    if games_service.remove(code):
+    if await asyncio.to_thread(games_service.remove, code):
         await message.answer("Удалено.")
     else:
         await message.answer("Не найдено.")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta, timezone
 
 from aiogram import F, Router
@@ -602,7 +603,8 @@ async def admin_games(call: CallbackQuery, session: AsyncSession) -> None:
     if not games or total == 0:
         text = "Список игр пуст."
     else:
-        lines = [f"- {g['code']}: {games_service.label(str(g['code']), 'ru')} / {g['name_en']}" for g in games]
+        codes = [str(g['code']) for g in games]
+        lines = [f"- {code}: {label} / {g['name_en']}" for code, label, g in zip(codes, games_service.labels(codes, 'ru'), games)]
         suffix = f"\n\nПоказано: {len(games)} из {total}."
         text = "Игры/режимы (топ по популярности):\n" + "\n".join(lines) + suffix
     lang = await _admin_lang(session, call.from_user.id)
@@ -614,6 +616,9 @@ async def admin_games(call: CallbackQuery, session: AsyncSession) -> None:
 async def admin_games_add(call: CallbackQuery, state: FSMContext) -> None:
     if not _is_admin(call.from_user.id):
         return
+    if games_service.readonly:
+        await safe_answer(call, "Каталог игр в этом процессе открыт только для чтения; измени его в основном боте.")
+        return
     await state.set_state(AdminPanelStates.games_add_code)
     await call.message.answer("Введи код игры (латиницей, без пробелов):")
     await safe_answer(call)
@@ -643,7 +648,7 @@ async def admin_games_add_names(message: Message, state: FSMContext) -> None:
         await message.answer("Формат: name_ru | name_en")
         return
     name_ru, name_en = [p.strip() for p in raw.split("|", 1)]
-    games_service.add(code, name_ru, name_en)
+    await asyncio.to_thread(games_service.add, code, name_ru, name_en)
     await state.clear()
     await message.answer("Добавлено. /admin чтобы открыть панель.")
 
@@ -652,6 +657,9 @@ async def admin_games_add_names(message: Message, state: FSMContext) -> None:
 async def admin_games_remove(call: CallbackQuery, state: FSMContext) -> None:
     if not _is_admin(call.from_user.id):
         return
+    if games_service.readonly:
+        await safe_answer(call, "Каталог игр в этом процессе открыт только для чтения; измени его в основном боте.")
+        return
     await state.set_state(AdminPanelStates.games_remove_code)
     await call.message.answer("Введи код игры для удаления:")
     await safe_answer(call)
@@ -662,7 +670,7 @@ async def admin_games_remove_code(message: Message, state: FSMContext) -> None:
     if not _is_admin(message.from_user.id):
         return
     code = (message.text or "").strip()
-    if games_service.remove(code):
+    if await asyncio.to_thread(games_service.remove, code):
         await message.answer("Удалено.")
     else:
         await message.answer("Код не найден.")
@@ -673,7 +681,7 @@ async def admin_games_remove_code(message: Message, state: FSMContext) -> None:
 async def admin_games_reload(call: CallbackQuery) -> None:
     if not _is_admin(call.from_user.id):
         return
-    games_service.load()
+    await asyncio.to_thread(games_service.load)
     await call.message.answer("Список игр обновлён.")
     await safe_answer(call)
 
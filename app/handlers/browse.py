@@ -217,7 +217,7 @@ async def browse_set_modes(call: CallbackQuery, state: FSMContext, session: Asyn
     await state.set_state(BrowseFilterStates.modes)
     sent = await call.message.answer(
         "Выбери режимы:" if user.language == "ru" else "Choose modes:",
-        reply_markup=modes_kb("browse_mode", user.language, selected, page=0),
+        reply_markup=await modes_kb("browse_mode", user.language, selected, page=0, owner=call.from_user.id),
     )
     await state.update_data(modes_msg_id=sent.message_id, modes_page=0)
     await safe_answer(call)
@@ -257,7 +257,7 @@ async def browse_modes_search(message: Message, state: FSMContext, session: Asyn
     text += f"\n\n🔍 Поиск: <code>{html.escape(query)}</code>" if query else ""
     sent = await message.answer(
         text,
-        reply_markup=modes_kb("browse_mode", user.language, selected, query=query or None, page=0),
+        reply_markup=await modes_kb("browse_mode", user.language, selected, query=query or None, page=0, owner=message.from_user.id),
     )
     await state.update_data(modes_msg_id=sent.message_id)
 
@@ -283,7 +283,7 @@ async def browse_modes_pick(call: CallbackQuery, state: FSMContext, session: Asy
     if code in {"__prev", "__next"}:
         page = max(0, page - 1) if code == "__prev" else page + 1
         await state.update_data(modes_page=page)
-        await safe_edit_reply_markup(call.message, reply_markup=modes_kb("browse_mode", user.language, selected, query=query, page=page))
+        await safe_edit_reply_markup(call.message, reply_markup=await modes_kb("browse_mode", user.language, selected, query=query, page=page, owner=call.from_user.id))
         await safe_answer(call)
         return
 
@@ -298,7 +298,7 @@ async def browse_modes_pick(call: CallbackQuery, state: FSMContext, session: Asy
 
     if code == "__clear":
         await state.update_data(modes_query=None, modes_page=0)
-        await safe_edit_reply_markup(call.message, reply_markup=modes_kb("browse_mode", user.language, selected, query=None, page=0))
+        await safe_edit_reply_markup(call.message, reply_markup=await modes_kb("browse_mode", user.language, selected, query=None, page=0, owner=call.from_user.id))
         await safe_answer(call)
         return
 
@@ -319,7 +319,7 @@ async def browse_modes_pick(call: CallbackQuery, state: FSMContext, session: Asy
         selected.append(code)
 
     await state.update_data(modes_selected=selected)
-    await safe_edit_reply_markup(call.message, reply_markup=modes_kb("browse_mode", user.language, selected, query=query, page=page))
+    await safe_edit_reply_markup(call.message, reply_markup=await modes_kb("browse_mode", user.language, selected, query=query, page=page, owner=call.from_user.id))
     await safe_answer(call)
 
 
@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from aiogram import F, Router
-from aiogram.filters import Command
+from aiogram.filters import Command, ExceptionTypeFilter
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, ErrorEvent, Message
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.keyboards.menu import main_menu_kb
 from app.repositories.user_repo import UserRepository
+from app.services.games import SearchSuperseded
 from app.services.matching import matching_service
 from app.utils.i18n import t
 from app.utils.tg import safe_answer
@@ -56,3 +57,11 @@ async def cancel_cmd(message: Message, state: FSMContext, session: AsyncSession)
         return
 
     await message.answer(t(lang, "cancel"), reply_markup=main_menu_kb(lang))
+
+
+@router.errors(ExceptionTypeFilter(SearchSuperseded))
+async def search_superseded_error(event: ErrorEvent) -> bool:
+    # A newer mode search from the same user is already rendering its keyboard.
+    if event.update.callback_query:
+        await safe_answer(event.update.callback_query)
+    return True
@@ -98,7 +98,7 @@ async def profile_edit_cb(call: CallbackQuery, state: FSMContext, session: Async
         await state.update_data(modes=list(user.modes), modes_query=None, modes_page=0)
         sent = await call.message.answer(
             t(lang, "ask_modes"),
-            reply_markup=modes_kb("edit_mode", lang, list(user.modes), page=0),
+            reply_markup=await modes_kb("edit_mode", lang, list(user.modes), page=0, owner=call.from_user.id),
         )
         await state.update_data(modes_msg_id=sent.message_id, modes_page=0)
     elif field == "bio":
@@ -212,7 +212,7 @@ async def edit_modes(call: CallbackQuery, state: FSMContext, session: AsyncSessi
     if code in {"__prev", "__next"}:
         page = max(0, page - 1) if code == "__prev" else page + 1
         await state.update_data(modes_page=page)
-        await safe_edit_reply_markup(call.message, reply_markup=modes_kb("edit_mode", lang, selected, query=query, page=page))
+        await safe_edit_reply_markup(call.message, reply_markup=await modes_kb("edit_mode", lang, selected, query=query, page=page, owner=call.from_user.id))
         await safe_answer(call)
         return
 
@@ -225,7 +225,7 @@ async def edit_modes(call: CallbackQuery, state: FSMContext, session: AsyncSessi
 
     if code == "__clear":
         await state.update_data(modes_query=None, modes_page=0)
-        await safe_edit_reply_markup(call.message, reply_markup=modes_kb("edit_mode", lang, selected, query=None, page=0))
+        await safe_edit_reply_markup(call.message, reply_markup=await modes_kb("edit_mode", lang, selected, query=None, page=0, owner=call.from_user.id))
         await safe_answer(call)
         return
 
@@ -248,7 +248,7 @@ async def edit_modes(call: CallbackQuery, state: FSMContext, session: AsyncSessi
             return
         selected.append(code)
     await state.update_data(modes=selected)
-    await safe_edit_reply_markup(call.message, reply_markup=modes_kb("edit_mode", lang, selected, query=query, page=page))
+    await safe_edit_reply_markup(call.message, reply_markup=await modes_kb("edit_mode", lang, selected, query=query, page=page, owner=call.from_user.id))
     await safe_answer(call)
 
 
@@ -286,7 +286,7 @@ async def edit_modes_search(message: Message, state: FSMContext, session: AsyncS
     text += f"\n\n🔍 Поиск: <code>{html.escape(query)}</code>" if query else ""
     sent = await message.answer(
         text,
-        reply_markup=modes_kb("edit_mode", user.language, selected, query=query or None, page=0),
+        reply_markup=await modes_kb("edit_mode", user.language, selected, query=query or None, page=0, owner=message.from_user.id),
     )
     await state.update_data(modes_msg_id=sent.message_id)
 
@@ -105,7 +105,7 @@ async def search_age(message: Message, state: FSMContext) -> None:
     await state.set_state(SearchStates.modes)
     data = await state.get_data()
     lang = data.get("language") or "ru"
-    sent = await message.answer(t(lang, "ask_modes"), reply_markup=modes_kb("search_mode", lang, []))
+    sent = await message.answer(t(lang, "ask_modes"), reply_markup=await modes_kb("search_mode", lang, [], owner=message.from_user.id))
     await state.update_data(modes_msg_id=sent.message_id, modes_page=0)
 
 
@@ -139,7 +139,7 @@ async def search_modes_search(message: Message, state: FSMContext) -> None:
 
     text = t(lang, "ask_modes")
     text += f"\n\n🔍 Поиск: <code>{html.escape(query)}</code>" if query else ""
-    sent = await message.answer(text, reply_markup=modes_kb("search_mode", lang, selected, query=query or None, page=0))
+    sent = await message.answer(text, reply_markup=await modes_kb("search_mode", lang, selected, query=query or None, page=0, owner=message.from_user.id))
     await state.update_data(modes_msg_id=sent.message_id)
 
 
@@ -161,7 +161,7 @@ async def search_modes(call: CallbackQuery, state: FSMContext) -> None:
     if code in {"__prev", "__next"}:
         page = max(0, page - 1) if code == "__prev" else page + 1
         await state.update_data(modes_page=page)
-        await safe_edit_reply_markup(call.message, reply_markup=modes_kb("search_mode", lang, selected, query=query, page=page))
+        await safe_edit_reply_markup(call.message, reply_markup=await modes_kb("search_mode", lang, selected, query=query, page=page, owner=call.from_user.id))
         await safe_answer(call)
         return
 
@@ -174,7 +174,7 @@ async def search_modes(call: CallbackQuery, state: FSMContext) -> None:
 
     if code == "__clear":
         await state.update_data(modes_query=None, modes_page=0)
-        await safe_edit_reply_markup(call.message, reply_markup=modes_kb("search_mode", lang, selected, query=None, page=0))
+        await safe_edit_reply_markup(call.message, reply_markup=await modes_kb("search_mode", lang, selected, query=None, page=0, owner=call.from_user.id))
         await safe_answer(call)
         return
 
@@ -200,7 +200,7 @@ async def search_modes(call: CallbackQuery, state: FSMContext) -> None:
             return
         selected.append(code)
     await state.update_data(modes=selected)
-    await safe_edit_reply_markup(call.message, reply_markup=modes_kb("search_mode", lang, selected, query=query, page=page))
+    await safe_edit_reply_markup(call.message, reply_markup=await modes_kb("search_mode", lang, selected, query=query, page=page, owner=call.from_user.id))
     await safe_answer(call)
 
 
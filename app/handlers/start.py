@@ -77,7 +77,7 @@ async def reg_lang(call: CallbackQuery, state: FSMContext) -> None:
         modes_msg_id=call.message.message_id,
     )
     await state.set_state(RegistrationStates.modes)
-    await safe_edit_text(call.message, t(lang, "ask_modes"), reply_markup=modes_kb("reg_mode", lang, []))
+    await safe_edit_text(call.message, t(lang, "ask_modes"), reply_markup=await modes_kb("reg_mode", lang, [], owner=call.from_user.id))
     await safe_answer(call)
 
 
@@ -99,7 +99,7 @@ async def reg_modes(call: CallbackQuery, state: FSMContext) -> None:
     if code in {"__prev", "__next"}:
         page = max(0, page - 1) if code == "__prev" else page + 1
         await state.update_data(modes_page=page)
-        await safe_edit_reply_markup(call.message, reply_markup=modes_kb("reg_mode", lang, selected, query=query, page=page))
+        await safe_edit_reply_markup(call.message, reply_markup=await modes_kb("reg_mode", lang, selected, query=query, page=page, owner=call.from_user.id))
         await safe_answer(call)
         return
 
@@ -112,7 +112,7 @@ async def reg_modes(call: CallbackQuery, state: FSMContext) -> None:
 
     if code == "__clear":
         await state.update_data(modes_query=None, modes_page=0)
-        await safe_edit_reply_markup(call.message, reply_markup=modes_kb("reg_mode", lang, selected, query=None, page=0))
+        await safe_edit_reply_markup(call.message, reply_markup=await modes_kb("reg_mode", lang, selected, query=None, page=0, owner=call.from_user.id))
         await safe_answer(call)
         return
 
@@ -134,7 +134,7 @@ async def reg_modes(call: CallbackQuery, state: FSMContext) -> None:
         selected.append(code)
 
     await state.update_data(modes=selected)
-    await safe_edit_reply_markup(call.message, reply_markup=modes_kb("reg_mode", lang, selected, query=query, page=page))
+    await safe_edit_reply_markup(call.message, reply_markup=await modes_kb("reg_mode", lang, selected, query=query, page=page, owner=call.from_user.id))
     await safe_answer(call)
 
 
@@ -168,7 +168,7 @@ async def reg_modes_search(message: Message, state: FSMContext) -> None:
 
     text = t(lang, "ask_modes")
     text += f"\n\n🔍 Поиск: <code>{html.escape(query)}</code>" if query else ""
-    sent = await message.answer(text, reply_markup=modes_kb("reg_mode", lang, selected, query=query or None, page=0))
+    sent = await message.answer(text, reply_markup=await modes_kb("reg_mode", lang, selected, query=query or None, page=0, owner=message.from_user.id))
     await state.update_data(modes_msg_id=sent.message_id)
 
 
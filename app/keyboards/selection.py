@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
-from app.services.games import games_service, _rusify_mixed_text
+from app.services.games import games_service
 from app.utils.i18n import t
 
 _PAGE_SIZE = 20
+_SUGGEST_MAX_LEN = 6
 
 
 def language_kb(prefix: str, lang: str, selected: str | None = None, include_any: bool = False):
@@ -24,19 +25,38 @@ def language_kb(prefix: str, lang: str, selected: str | None = None, include_any
     return b.as_markup()
 
 
-def modes_kb(prefix: str, lang: str, selected: list[str], query: str | None = None, page: int = 0):
+async def modes_kb(
+    prefix: str,
+    lang: str,
+    selected: list[str],
+    query: str | None = None,
+    page: int = 0,
+    owner: int | None = None,
+):
     b = InlineKeyboardBuilder()
     selected_set = set(selected)
 
-    for code in selected:
-        game = games_service.get(code) or {"code": code, "name_ru": code, "name_en": code}
-        label = game.get("name_en") if lang == "en" else _rusify_mixed_text(str(game.get("name_ru") or code))
+    for code, label in zip(selected, games_service.labels(selected, lang)):
         b.button(text=f"✅ {label}", callback_data=f"{prefix}:{code}")
 
-    if query:
-        page_items, total = games_service.search(query, page, _PAGE_SIZE, exclude_codes=selected_set)
+    if not query:
+        page_items, total = await games_service.apage(
+            page,
+            _PAGE_SIZE,
+            exclude_codes=selected_set,
+            owner=owner,
+            order="popular",
+        )
     else:
-        page_items, total = games_service.page(page, _PAGE_SIZE, exclude_codes=selected_set)
+        page_items, total = [], 0
+        if len(query.split()) == 1 and len(query) <= _SUGGEST_MAX_LEN:
+            # Short single word: complete it as a prefix; one extra item tells whether a next page exists.
+            found = await games_service.asuggest(query, (page + 1) * _PAGE_SIZE + 1, exclude_codes=selected_set, owner=owner)
+            total = len(found)
+            page = min(page, max(0, (total - 1) // _PAGE_SIZE))
+            page_items = found[page * _PAGE_SIZE : (page + 1) * _PAGE_SIZE]
+        if not total:
+            page_items, total = await games_service.asearch(query, page, _PAGE_SIZE, exclude_codes=selected_set, owner=owner)
 
     if total == 0:
         b.button(text="Ничего не найдено" if lang == "ru" else "No matches", callback_data=f"{prefix}:__noop")
@@ -44,10 +64,9 @@ def modes_kb(prefix: str, lang: str, selected: list[str], query: str | None = No
         max_page = max(0, (total - 1) // _PAGE_SIZE)
         page = max(0, min(int(page or 0), max_page))
 
-        for game in page_items:
-            code = str(game.get("code") or "")
-            label = game.get("name_en") if lang == "en" else _rusify_mixed_text(str(game.get("name_ru") or code))
-            b.button(text=str(label), callback_data=f"{prefix}:{code}")
+        codes = [str(game.get("code") or "") for game in page_items]
+        for code, label in zip(codes, games_service.labels(codes, lang)):
+            b.button(text=label, callback_data=f"{prefix}:{code}")
 
         if page > 0:
             b.button(text="⬅️", callback_data=f"{prefix}:__prev")
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
@@ -14,6 +15,8 @@ from app.handlers import start, profile, browse, search, chat, admin, admin_pane
 from app.middlewares.activity import ActivityMiddleware
 from app.middlewares.ban import BanMiddleware
 from app.middlewares.db import DBSessionMiddleware
+from app.services.batch_matcher import BatchMatcher
+from app.services.games import games_service
 from app.services.reengage import ReengageService
 
 
@@ -38,15 +41,32 @@ async def main() -> None:
     dp.include_router(search.router)
     dp.include_router(chat.router)
 
+    # The games catalog opens (and migrates, if needed) in a thread while the database initializes.
+    started = time.perf_counter()
+    games_warmup = asyncio.create_task(asyncio.to_thread(games_service.warmup))
     await init_db()
+    db_seconds = time.perf_counter() - started
+    games_timings = await games_warmup
+    logging.info(
+        "Startup took %.2fs: init_db %.2fs, games %s",
+        time.perf_counter() - started,
+        db_seconds,
+        ", ".join(f"{step} {seconds:.2f}s" for step, seconds in games_timings.items()) or "already loaded",
+    )
+
+    games_refresh = asyncio.create_task(games_service.watch())
 
     reengage = ReengageService(bot)
     reengage.start()
+    batch_matcher = BatchMatcher(bot)
+    batch_matcher.start()
 
     try:
         await dp.start_polling(bot)
     finally:
+        games_refresh.cancel()
         reengage.stop()
+        batch_matcher.stop()
         await close_db()
 
 
@@ -6,6 +6,7 @@ from app.models.match_offer import MatchOffer
 from app.models.chat import ChatSession
 from app.models.message import ChatMessage
 from app.models.report import Report
+from app.models.cooldown import PairCooldown
 
 __all__ = [
     "Base",
@@ -16,5 +17,6 @@ __all__ = [
     "ChatSession",
     "ChatMessage",
     "Report",
+    "PairCooldown",
 ]
 
@@ -5,6 +5,7 @@ from app.repositories.offer_repo import OfferRepository
 from app.repositories.chat_repo import ChatRepository
 from app.repositories.message_repo import MessageRepository
 from app.repositories.report_repo import ReportRepository
+from app.repositories.cooldown_repo import CooldownRepository
 
 __all__ = [
     "UserRepository",
@@ -14,5 +15,6 @@ __all__ = [
     "ChatRepository",
     "MessageRepository",
     "ReportRepository",
+    "CooldownRepository",
 ]
 
@@ -40,3 +40,11 @@ class BlockRepository:
         )
         return (await self.session.scalar(stmt)) is not None
 
+    async def list_pairs_among(self, user_ids: list[int]) -> set[tuple[int, int]]:
+        """Blocked pairs within user_ids as (smaller id, larger id), whichever side blocked."""
+        if not user_ids:
+            return set()
+        stmt = select(Block.blocker_id, Block.blocked_id).where(
+            Block.blocker_id.in_(user_ids), Block.blocked_id.in_(user_ids)
+        )
+        return {(min(a, b), max(a, b)) for a, b in (await self.session.execute(stmt)).all()}
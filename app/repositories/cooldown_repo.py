@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.cooldown import PairCooldown
+
+
+class CooldownRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def set(self, user_a: int, user_b: int, expires_at: datetime) -> None:
+        # Both users of a pair may decline or block at once, so this must not race on the primary key.
+        stmt = insert(PairCooldown).values(
+            user_low=min(user_a, user_b), user_high=max(user_a, user_b), expires_at=expires_at
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[PairCooldown.user_low, PairCooldown.user_high],
+                set_={"expires_at": stmt.excluded.expires_at},
+            )
+        )
+
+    async def partners(self, user_id: int, now: datetime) -> set[int]:
+        stmt = select(PairCooldown.user_low, PairCooldown.user_high).where(
+            or_(PairCooldown.user_low == user_id, PairCooldown.user_high == user_id),
+            PairCooldown.expires_at > now,
+        )
+        return {high if low == user_id else low for low, high in (await self.session.execute(stmt)).all()}
+
+    async def pairs_among(self, user_ids: list[int], now: datetime) -> set[tuple[int, int]]:
+        if not user_ids:
+            return set()
+        stmt = select(PairCooldown.user_low, PairCooldown.user_high).where(
+            PairCooldown.user_low.in_(user_ids),
+            PairCooldown.user_high.in_(user_ids),
+            PairCooldown.expires_at > now,
+        )
+        return {(low, high) for low, high in (await self.session.execute(stmt)).all()}
+
+    async def delete_expired(self, now: datetime) -> int:
+        result = await self.session.execute(delete(PairCooldown).where(PairCooldown.expires_at <= now))
+        return result.rowcount or 0
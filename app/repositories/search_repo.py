@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import and_, delete, exists, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.block import Block
 from app.models.search import SearchRequest
+from app.models.user import User
 
 
 class SearchRepository:
@@ -52,3 +54,55 @@ class SearchRepository:
         stmt = select(SearchRequest).where(SearchRequest.status == "waiting")
         return list((await self.session.scalars(stmt)).all())
 
+    async def list_waiting_with_users(self, after_id: int = 0) -> list[tuple[SearchRequest, User]]:
+        stmt = (
+            select(SearchRequest, User)
+            .join(User, User.id == SearchRequest.user_id)
+            .where(SearchRequest.status == "waiting", SearchRequest.id > after_id)
+            .order_by(SearchRequest.id.asc())
+        )
+        return [(req, user) for req, user in (await self.session.execute(stmt)).all()]
+
+    async def list_candidates(
+        self, req: SearchRequest, user: User, request_ids: list[int]
+    ) -> list[tuple[SearchRequest, User]]:
+        """Waiting requests among request_ids that could pair with req, oldest first.
+
+        Banned users, blocked pairs and language/age mismatches in either direction are filtered out here;
+        modes are JSON lists and are left to the caller.
+        """
+        blocked = exists().where(
+            or_(
+                and_(Block.blocker_id == user.id, Block.blocked_id == SearchRequest.user_id),
+                and_(Block.blocker_id == SearchRequest.user_id, Block.blocked_id == user.id),
+            )
+        )
+        stmt = (
+            select(SearchRequest, User)
+            .join(User, User.id == SearchRequest.user_id)
+            .where(
+                SearchRequest.id.in_(request_ids),
+                SearchRequest.status == "waiting",
+                SearchRequest.user_id != user.id,
+                User.is_banned.is_(False),
+                User.age.between(req.min_age, req.max_age),
+                SearchRequest.min_age <= user.age,
+                SearchRequest.max_age >= user.age,
+                or_(SearchRequest.language.is_(None), SearchRequest.language == user.language),
+                ~blocked,
+            )
+            .order_by(SearchRequest.id.asc())
+        )
+        if req.language:
+            stmt = stmt.where(User.language == req.language)
+        return [(other_req, other_user) for other_req, other_user in (await self.session.execute(stmt)).all()]
+
+    async def claim(self, request_ids: list[int]) -> dict[int, str]:
+        """Row-lock the given requests for this transaction; rows locked by anyone else are left out."""
+        stmt = (
+            select(SearchRequest.id, SearchRequest.status)
+            .where(SearchRequest.id.in_(request_ids))
+            .order_by(SearchRequest.id.asc())
+            .with_for_update(skip_locked=True)
+        )
+        return {request_id: status for request_id, status in (await self.session.execute(stmt)).all()}
@@ -1,9 +1,11 @@
+from app.services.batch_matcher import BatchMatcher
 from app.services.games import games_service, GamesService
 from app.services.matching import matching_service, MatchingService
 from app.services.offers import offer_service, OfferService
 from app.services.reengage import ReengageService
 
 __all__ = [
+    "BatchMatcher",
     "games_service",
     "GamesService",
     "matching_service",
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from aiogram import Bot
+
+from app.config import settings
+from app.db import SessionMaker
+from app.keyboards.offers import match_actions_kb
+from app.repositories.offer_repo import OfferRepository
+from app.repositories.user_repo import UserRepository
+from app.services.matching import matching_service
+from app.utils.cards import format_profile
+from app.utils.i18n import t
+
+logger = logging.getLogger(__name__)
+
+
+class BatchMatcher:
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self.scheduler = AsyncIOScheduler()
+
+    def start(self) -> None:
+        if settings.match_batch_interval_sec <= 0:
+            return
+        self.scheduler.add_job(
+            self._run_tick,
+            "interval",
+            seconds=settings.match_batch_interval_sec,
+            next_run_time=datetime.now(timezone.utc) + timedelta(seconds=settings.match_batch_interval_sec),
+            max_instances=1,
+            coalesce=True,
+        )
+        self.scheduler.start()
+
+    def stop(self) -> None:
+        try:
+            self.scheduler.shutdown(wait=False)
+        except Exception:
+            pass
+
+    async def _run_tick(self) -> None:
+        async with SessionMaker() as session:
+            offer_ids = await matching_service.match_waiting(session)
+            await session.commit()
+            if offer_ids:
+                logger.info("Batch matcher created %s offers", len(offer_ids))
+
+            offer_repo = OfferRepository(session)
+            user_repo = UserRepository(session)
+            for offer_id in offer_ids:
+                offer = await offer_repo.get(offer_id)
+                if not offer:
+                    continue
+                u1 = await user_repo.get(offer.user1_id)
+                u2 = await user_repo.get(offer.user2_id)
+                if not u1 or not u2:
+                    continue
+                for me, other in ((u1, u2), (u2, u1)):
+                    try:
+                        await self.bot.send_message(
+                            me.id,
+                            t(me.language, "match_found") + "\n\n" + format_profile(other, me.language),
+                            reply_markup=match_actions_kb(offer_id, me.language),
+                        )
+                    except Exception:
+                        logger.warning("Could not notify %s about offer %s", me.id, offer_id)
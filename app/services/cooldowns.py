@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import heapq
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.cooldown_repo import CooldownRepository
+
+
+def _pair(user_a: int, user_b: int) -> tuple[int, int]:
+    return (user_a, user_b) if user_a < user_b else (user_b, user_a)
+
+
+class PairCooldowns(ABC):
+    """Pairs of users who must not be matched again until their cooldown expires.
+
+    The session is the caller's transaction; stores that keep nothing in the database ignore it.
+    """
+
+    def __init__(self, ttl_sec: float):
+        self.ttl_sec = ttl_sec
+
+    @abstractmethod
+    async def add(self, session: AsyncSession, user_a: int, user_b: int) -> None:
+        """Start (or restart) the cooldown of a pair."""
+
+    @abstractmethod
+    async def partners(self, session: AsyncSession, user_id: int) -> set[int]:
+        """Users still cooling down with user_id."""
+
+    @abstractmethod
+    async def pairs_among(self, session: AsyncSession, user_ids: list[int]) -> set[tuple[int, int]]:
+        """Cooling pairs within user_ids as (smaller id, larger id)."""
+
+
+class MemoryPairCooldowns(PairCooldowns):
+    """Per-process cooldowns; expired pairs are popped off a heap on every call, and the oldest go past max_size."""
+
+    def __init__(self, ttl_sec: float, max_size: int = 100_000):
+        super().__init__(ttl_sec)
+        self.max_size = max_size
+        self._expires: dict[tuple[int, int], float] = {}
+        self._by_user: dict[int, set[int]] = {}
+        self._heap: list[tuple[float, tuple[int, int]]] = []
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def _drop(self, key: tuple[int, int]) -> None:
+        del self._expires[key]
+        for user_id, other in (key, key[::-1]):
+            partners = self._by_user.get(user_id)
+            if partners is not None:
+                partners.discard(other)
+                if not partners:
+                    del self._by_user[user_id]
+
+    def sweep(self) -> int:
+        now = time.monotonic()
+        dropped = 0
+        while self._heap and (self._heap[0][0] <= now or len(self._expires) > self.max_size):
+            expires_at, key = heapq.heappop(self._heap)
+            # Re-adding a pair pushes a newer entry; older heap entries for it are stale.
+            if self._expires.get(key) == expires_at:
+                self._drop(key)
+                dropped += 1
+        # Stale entries pile up when the same pairs keep getting re-added.
+        if len(self._heap) > 2 * len(self._expires) + 64:
+            self._heap = [(expires_at, key) for key, expires_at in self._expires.items()]
+            heapq.heapify(self._heap)
+        return dropped
+
+    async def add(self, session: AsyncSession, user_a: int, user_b: int) -> None:
+        key = _pair(user_a, user_b)
+        expires_at = time.monotonic() + self.ttl_sec
+        self._expires[key] = expires_at
+        self._by_user.setdefault(key[0], set()).add(key[1])
+        self._by_user.setdefault(key[1], set()).add(key[0])
+        heapq.heappush(self._heap, (expires_at, key))
+        self.sweep()
+
+    async def partners(self, session: AsyncSession, user_id: int) -> set[int]:
+        self.sweep()
+        return set(self._by_user.get(user_id, ()))
+
+    async def pairs_among(self, session: AsyncSession, user_ids: list[int]) -> set[tuple[int, int]]:
+        self.sweep()
+        wanted = set(user_ids)
+        return {
+            _pair(user_id, other)
+            for user_id in wanted
+            for other in self._by_user.get(user_id, ())
+            if other in wanted
+        }
+
+
+class DatabasePairCooldowns(PairCooldowns):
+    """Cooldowns in the pair_cooldowns table, shared by every bot process and kept across restarts."""
+
+    def __init__(self, ttl_sec: float, sweep_interval_sec: float = 60):
+        super().__init__(ttl_sec)
+        self.sweep_interval_sec = sweep_interval_sec
+        self._swept_at = 0.0
+
+    async def add(self, session: AsyncSession, user_a: int, user_b: int) -> None:
+        now = datetime.now(timezone.utc)
+        repo = CooldownRepository(session)
+        await repo.set(user_a, user_b, now + timedelta(seconds=self.ttl_sec))
+        # Lookups ignore expired rows anyway; deleting them now and then keeps the table small.
+        if time.monotonic() - self._swept_at >= self.sweep_interval_sec:
+            self._swept_at = time.monotonic()
+            await repo.delete_expired(now)
+
+    async def partners(self, session: AsyncSession, user_id: int) -> set[int]:
+        return await CooldownRepository(session).partners(user_id, datetime.now(timezone.utc))
+
+    async def pairs_among(self, session: AsyncSession, user_ids: list[int]) -> set[tuple[int, int]]:
+        return await CooldownRepository(session).pairs_among(user_ids, datetime.now(timezone.utc))
+
+
+def make_pair_cooldowns(store: str | None, ttl_sec: float) -> PairCooldowns:
+    key = (store or "").strip().lower()
+    if key == "memory":
+        return MemoryPairCooldowns(ttl_sec)
+    if key == "db":
+        return DatabasePairCooldowns(ttl_sec)
+    raise ValueError(f"Unknown pair cooldown store: {store!r}")
@@ -1,21 +1,48 @@
 from __future__ import annotations
 
+import asyncio
+import bisect
+import functools
+import heapq
 import json
+import logging
+import os
 import re
-from difflib import SequenceMatcher
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+from app.config import settings
+from app.services.similarity import Matcher, get_similarity_engine, length_bound, levenshtein_matcher
 
 try:
-    from mdbx import Cursor, Env, MDBXCursorOp, MDBXDBFlags, MDBXEnvFlags
+    from mdbx import Cursor, Env, MDBXCursorOp, MDBXDBFlags, MDBXEnvFlags, MDBXError, MDBXErrorExc
     from mdbx.mdbx import MDBXPutFlags
 
     _HAS_MDBX = True
 except Exception:  # pragma: no cover
     Cursor = Env = None  # type: ignore[assignment]
-    MDBXCursorOp = MDBXDBFlags = MDBXEnvFlags = MDBXPutFlags = None  # type: ignore[assignment]
+    MDBXCursorOp = MDBXDBFlags = MDBXEnvFlags = MDBXError = MDBXPutFlags = None  # type: ignore[assignment]
+    MDBXErrorExc = Exception  # type: ignore[assignment,misc]
     _HAS_MDBX = False
 
-_SPACE_RE = re.compile(r"\s+")
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: the writer lock only covers this process
+    fcntl = None  # type: ignore[assignment]
+
+_NON_ALNUM_RE = re.compile(r"[\W_]+")  # \w is exactly str.isalnum() plus "_"
 
 _EN_TO_RU = str.maketrans(
     "qwertyuiop[]asdfghjkl;'zxcvbnm,.",
@@ -128,30 +155,65 @@ _RU_CHAR_MAP = {
     "z": "\u0437",
 }
 
-MDBX_SCHEMA_VERSION = 3
+_RU_TO_LAT_TABLE = str.maketrans(_RU_TO_LAT)
+# Digraphs first, in list order, so the alternation matches them before their single letters.
+_EN_TO_RU_RE = re.compile("|".join([pat for pat, _ in _RU_DIGRAPHS] + ["[a-z]"]))
+_EN_TO_RU_MAP = {**_RU_CHAR_MAP, **dict(_RU_DIGRAPHS)}
+
+MDBX_SCHEMA_VERSION = 10
 MDBX_MAP_META = b"meta"
-MDBX_MAP_GAMES = b"games"
+MDBX_MAP_GAMES = b"games"  # code(bytes) -> binary record, see _encode_game
+MDBX_MAP_SIG = b"sig"  # code(bytes) -> playerCount, hay, hay_lat, targets joined by _SIG_SEP
 MDBX_MAP_ORDER = b"order"  # rank(u32be) -> code(bytes)
 MDBX_MAP_RANK = b"rank"  # code(bytes) -> rank(u32be)
+# Whole words only; a prefix is looked up as a range scan over the sorted keys.
 MDBX_MAP_TOKEN = b"token"  # token(bytes) -> dupsort(rank(u32be)+code(bytes))
+MDBX_MAP_DF = b"df"  # token(bytes) -> number of postings (u32be)
+MDBX_MAP_POP = b"pop"  # (0xFFFFFFFF - playerCount)(u32be) + rank(u32be) -> code(bytes)
+# Trigrams of every indexed token, keyed with the token's length so typo lookups only visit similar lengths.
+MDBX_MAP_GRAM = b"gram"  # trigram(bytes) + token length(u8) -> dupsort(token(bytes))
+# Catalog maps exist in two slots; meta["slot"] names the live one and import_stream fills the other.
+# Every committed catalog write bumps meta["generation"]; other processes poll it to know when to reload.
+# Slot 0 keeps the unsuffixed names so existing databases open as-is.
+_SLOT_META_KEYS = (b"count", b"next_rank", b"holes")
+
+_SIG_SEP = "\x1f"
+# version, playerCount, byte lengths of code/name_ru/name_en/label_ru; the strings follow, then JSON of any other fields.
+# label_ru is display_name(game, "ru") rendered at write time; the English label is name_en itself.
+_GAME_RECORD = struct.Struct(">BIHHHH")
+_GAME_RECORD_VERSION = 2
+_GAME_RECORD_V1 = struct.Struct(">BIHHH")
+_GAME_CORE_FIELDS = ("code", "name_ru", "name_en", "playerCount")
+_MATCH_CUTOFF = 0.55
+_MIN_RANK_HOLES_TO_COMPACT = 64
+_MAX_POSTINGS = 6000
+_MAX_PREFIX_SCAN = 50_000
+_MIN_INTERSECTION_HITS = 100
+# Shorter query tokens match whole words only, and only when a variant has nothing longer.
+_MIN_PREFIX_LEN = 3
+_MIN_TYPO_LEN = 4
+_MAX_TYPO_FIXES = 8
+_MAX_CACHED_GAPS = 512
+_POP_MARK_EVERY = 256
 
 
 def _norm(text: str) -> str:
-    text = (text or "").casefold().replace("_", " ").replace("-", " ")
-    buf = [" " if not ch.isalnum() else ch for ch in text]
-    return _SPACE_RE.sub(" ", "".join(buf)).strip()
+    return _NON_ALNUM_RE.sub(" ", (text or "").casefold()).strip()
 
 
 def _translit_ru_to_lat(text: str) -> str:
-    text = (text or "").casefold()
-    return "".join(_RU_TO_LAT.get(ch, ch) for ch in text)
+    return (text or "").casefold().translate(_RU_TO_LAT_TABLE)
 
 
 def _query_variants(query: str | None) -> list[str]:
     raw = (query or "").strip()
     if not raw:
         return []
+    return list(_cached_query_variants(raw))
+
 
+@functools.lru_cache(maxsize=4096)
+def _cached_query_variants(raw: str) -> tuple[str, ...]:
     variants = [
         raw,
         raw.translate(_RU_TO_EN),
@@ -165,7 +227,7 @@ def _query_variants(query: str | None) -> list[str]:
         nv = _norm(v)
         if nv and nv not in out:
             out.append(nv)
-    return out
+    return tuple(out)
 
 
 def _preserve_case(src: str, replacement: str) -> str:
@@ -179,36 +241,30 @@ def _preserve_case(src: str, replacement: str) -> str:
 
 
 def _translit_en_to_ru(word: str) -> str:
-    w = (word or "").casefold()
-    out: list[str] = []
-    i = 0
-    while i < len(w):
-        matched = False
-        for pat, rep in _RU_DIGRAPHS:
-            if w.startswith(pat, i):
-                out.append(rep)
-                i += len(pat)
-                matched = True
-                break
-        if matched:
-            continue
-        ch = w[i]
-        out.append(_RU_CHAR_MAP.get(ch, ch))
-        i += 1
-    return "".join(out)
+    return _EN_TO_RU_RE.sub(lambda m: _EN_TO_RU_MAP[m.group(0)], (word or "").casefold())
+
 
+@functools.lru_cache(maxsize=65536)
+def _rusify_word(word: str) -> str:
+    mapped = _RU_WORD_MAP.get(word.casefold())
+    replacement = mapped if mapped is not None else _translit_en_to_ru(word)
+    return _preserve_case(word, replacement)
 
+
+@functools.lru_cache(maxsize=16384)
 def _rusify_mixed_text(text: str) -> str:
-    def repl(match: re.Match[str]) -> str:
-        word = match.group(0)
-        mapped = _RU_WORD_MAP.get(word.casefold())
-        replacement = mapped if mapped is not None else _translit_en_to_ru(word)
-        return _preserve_case(word, replacement)
+    return _LATIN_WORD_RE.sub(lambda m: _rusify_word(m.group(0)), text or "")
 
-    return _LATIN_WORD_RE.sub(repl, text or "")
 
+def display_name(game: Mapping[str, Any], lang: str) -> str:
+    """Button/profile label of a game: the English name, or the Russian one with latin words rusified."""
+    code = str(game.get("code") or "")
+    if lang == "en":
+        return str(game.get("name_en") or code)
+    return _rusify_mixed_text(str(game.get("name_ru") or code))
 
-def _game_match_score(game: dict, query_variants: list[str]) -> float:
+
+def _game_search_texts(game: dict) -> tuple[str, str, list[str]]:
     code = str(game.get("code") or "")
     name_ru = str(game.get("name_ru") or "")
     name_en = str(game.get("name_en") or "")
@@ -230,9 +286,104 @@ def _game_match_score(game: dict, query_variants: list[str]) -> float:
         _norm(_translit_ru_to_lat(rus_ru)),
         _norm(_translit_ru_to_lat(rus_en)),
     ]
+    return hay, hay_lat, targets
+
+
+def _encode_signature(game: dict) -> bytes:
+    hay, hay_lat, targets = _game_search_texts(game)
+    unique_targets = list(dict.fromkeys(t for t in targets if t))
+    pop = int(game.get("playerCount") or 0)
+    return _SIG_SEP.join([str(pop), hay, hay_lat, *unique_targets]).encode("utf-8")
+
+
+def _decode_signature(raw: bytes) -> tuple[int, str, str, list[str]]:
+    parts = raw.decode("utf-8").split(_SIG_SEP)
+    try:
+        pop = int(parts[0])
+    except ValueError:
+        pop = 0
+    hay = parts[1] if len(parts) > 1 else ""
+    hay_lat = parts[2] if len(parts) > 2 else ""
+    return pop, hay, hay_lat, parts[3:]
+
+
+def _encode_game(game: dict) -> bytes:
+    code = str(game["code"]).encode("utf-8")
+    name_ru = str(game["name_ru"]).encode("utf-8")
+    name_en = str(game["name_en"]).encode("utf-8")
+    label_ru = display_name(game, "ru").encode("utf-8")
+    pop = _player_count(game.get("playerCount"))
+    extras = {k: v for k, v in game.items() if k not in _GAME_CORE_FIELDS}
+    tail = json.dumps(extras, ensure_ascii=False, separators=(",", ":")).encode("utf-8") if extras else b""
+    head = _GAME_RECORD.pack(_GAME_RECORD_VERSION, pop, len(code), len(name_ru), len(name_en), len(label_ru))
+    return b"".join((head, code, name_ru, name_en, label_ru, tail))
+
+
+def _unpack_game(raw: bytes) -> tuple[int, list[str], int] | None:
+    """playerCount, the record's strings and the offset of the JSON tail; None for unknown layouts."""
+    version = raw[0] if raw else 0
+    if version == _GAME_RECORD_VERSION and len(raw) >= _GAME_RECORD.size:
+        _, pop, *lengths = _GAME_RECORD.unpack_from(raw)
+        pos = _GAME_RECORD.size
+    elif version == 1 and len(raw) >= _GAME_RECORD_V1.size:
+        _, pop, *lengths = _GAME_RECORD_V1.unpack_from(raw)
+        pos = _GAME_RECORD_V1.size
+    else:
+        return None
+    view = memoryview(raw)
+    strings: list[str] = []
+    for n in lengths:
+        strings.append(str(view[pos : pos + n], "utf-8"))
+        pos += n
+    return pop, strings, pos
+
 
+def _decode_game(raw: bytes, extras: bool = True) -> dict | None:
+    if raw[:1] == b"{":
+        try:
+            obj = json.loads(raw.decode("utf-8"))
+        except ValueError:
+            return None
+        return _ensure_game_fields(obj) if isinstance(obj, dict) else None
+    unpacked = _unpack_game(raw)
+    if unpacked is None:
+        return None
+
+    pop, strings, pos = unpacked
+    game = {"code": strings[0], "name_ru": strings[1], "name_en": strings[2], "playerCount": pop}
+    if extras and pos < len(raw):
+        try:
+            tail = json.loads(str(memoryview(raw)[pos:], "utf-8"))
+        except ValueError:
+            tail = None
+        if isinstance(tail, dict):
+            for k, v in tail.items():
+                game.setdefault(k, v)
+    return game
+
+
+def _decode_label(raw: bytes, lang: str) -> str | None:
+    unpacked = _unpack_game(raw) if raw[:1] != b"{" else None
+    if unpacked is None:
+        game = _decode_game(raw, extras=False)
+        return None if game is None else display_name(game, lang)
+    strings = unpacked[1]
+    if lang == "en":
+        return strings[2] or strings[0]
+    if len(strings) > 3:
+        return strings[3]
+    return _rusify_mixed_text(strings[1] or strings[0])
+
+
+def _signature_match_score(
+    hay: str,
+    hay_lat: str,
+    targets: list[str],
+    query_variants: list[str],
+    matchers: list[Matcher],
+) -> float:
     best = 0.0
-    for q in query_variants:
+    for q, match in zip(query_variants, matchers):
         if not q:
             continue
         tokens = q.split()
@@ -248,12 +399,154 @@ def _game_match_score(game: dict, query_variants: list[str]) -> float:
         for target in targets:
             if not target:
                 continue
-            ratio = max(ratio, SequenceMatcher(None, q, target).ratio())
+            ratio = max(ratio, match(target))
         best = max(best, ratio)
 
     return best
 
 
+def _coverage_score(hay: str, hay_lat: str, query_variants: list[str]) -> float:
+    best = 0.0
+    for q in query_variants:
+        tokens = q.split()
+        if not tokens:
+            continue
+        matched = sum(1 for t in tokens if t in hay or t in hay_lat)
+        if matched == len(tokens):
+            return 1.0
+        best = max(best, (matched / len(tokens)) * 0.7)
+    return best
+
+
+def _fuzzy_upper_bound(targets: list[str], query_lengths: set[int]) -> float:
+    best = 0.0
+    for n in {len(t) for t in targets}:
+        for m in query_lengths:
+            bound = length_bound(m, n)
+            if bound > best:
+                best = bound
+    return best
+
+
+def _read_search_texts(txn, maps: _SlotMaps, code_b: bytes) -> tuple[int, str, str, list[str]] | None:
+    sig_raw = maps.sig.get(txn, code_b)
+    if sig_raw:
+        return _decode_signature(sig_raw)
+    raw = maps.games.get(txn, code_b)
+    game = _decode_game(raw, extras=False) if raw else None
+    if game is None:
+        return None
+    hay, hay_lat, targets = _game_search_texts(game)
+    return int(game.get("playerCount") or 0), hay, hay_lat, targets
+
+
+def _update_df(txn, maps: _SlotMaps, deltas: dict[str, int]) -> None:
+    """Apply posting count changes; a token entering or leaving the index also gains or loses its trigrams."""
+    for token, delta in deltas.items():
+        if not delta:
+            continue
+        key = token.encode("utf-8")
+        old = _u32be_to_int(maps.df.get(txn, key)) or 0
+        n = old + delta
+        if n > 0:
+            maps.df.put(txn, key, _u32be(n), flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
+            if not old:
+                for gram in _trigrams(token):
+                    maps.gram.put(txn, _gram_key(gram, len(token)), key, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
+        else:
+            _delete_entry(maps.df, txn, key)
+            if old:
+                for gram in _trigrams(token):
+                    _delete_entry(maps.gram, txn, _gram_key(gram, len(token)), key)
+
+
+def _trigrams(word: str) -> set[str]:
+    padded = f" {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _gram_key(gram: str, length: int) -> bytes:
+    return gram.encode("utf-8") + bytes((min(length, 255),))
+
+
+def _key_matches(key: bytes, token_b: bytes) -> bool:
+    return key.startswith(token_b) if len(token_b) >= _MIN_PREFIX_LEN else key == token_b
+
+
+def _prefix_df(cur, prefix: str) -> int:
+    """Number of postings under all tokens starting with prefix, summed from the df map."""
+    prefix_b = prefix.encode("utf-8")
+    total = 0
+    k, v = cur.get_full(prefix_b, MDBXCursorOp.MDBX_SET_RANGE)  # type: ignore[arg-type]
+    while k is not None and _key_matches(k, prefix_b):
+        total += _u32be_to_int(v) or 0
+        k, v = cur.get_full(None, MDBXCursorOp.MDBX_NEXT)  # type: ignore[arg-type]
+    return total
+
+
+def _typo_fixes(cur, token: str) -> list[str]:
+    """Indexed tokens within one or two edits of token, found through shared trigrams."""
+    n = len(token)
+    grams = _trigrams(token)
+    shared: Counter[bytes] = Counter()
+    for gram in grams:
+        for length in range(max(2, n - 2), n + 3):
+            k, v = cur.get_full(_gram_key(gram, length), MDBXCursorOp.MDBX_SET_KEY)  # type: ignore[arg-type]
+            while v is not None:
+                shared[v] += 1
+                k, v = cur.get_full(None, MDBXCursorOp.MDBX_NEXT_DUP)  # type: ignore[arg-type]
+
+    max_edits = 1 if n <= _MIN_TYPO_LEN else 2
+    match = levenshtein_matcher(token, 1.0 - max_edits / n)
+    need = max(1, len(grams) // 3)
+    fixes: list[tuple[float, str]] = []
+    for word_b, common in shared.items():
+        if common < need:
+            continue
+        word = word_b.decode("utf-8", errors="ignore")
+        score = match(word)
+        if score >= 1.0 - max_edits / max(n, len(word)):
+            fixes.append((score, word))
+    return [w for _, w in heapq.nlargest(_MAX_TYPO_FIXES, fixes)]
+
+
+def _read_postings(cur, prefix: str, limit: int) -> dict[str, int]:
+    """code -> rank for the `limit` best ranked games with a token starting with prefix."""
+    prefix_b = prefix.encode("utf-8")
+    found: dict[str, int] = {}
+    scanned = 0
+    k, v = cur.get_full(prefix_b, MDBXCursorOp.MDBX_SET_RANGE)  # type: ignore[arg-type]
+    while k is not None and v is not None and _key_matches(k, prefix_b) and scanned < _MAX_PREFIX_SCAN:
+        scanned += 1
+        rank = _u32be_to_int(v[:4])
+        code_s = v[4:].decode("utf-8", errors="ignore")
+        if code_s and rank is not None and (code_s not in found or rank < found[code_s]):
+            found[code_s] = rank
+        k, v = cur.get_full(None, MDBXCursorOp.MDBX_NEXT)  # type: ignore[arg-type]
+    if len(found) <= limit:
+        return dict(sorted(found.items(), key=lambda x: x[1]))
+    return dict(heapq.nsmallest(limit, found.items(), key=lambda x: x[1]))
+
+
+def _slot_map_name(name: bytes, slot: int) -> bytes:
+    return name if slot == 0 else name + b"@" + str(slot).encode("utf-8")
+
+
+def _slot_meta_key(key: bytes, slot: int) -> bytes:
+    return key if slot == 0 else str(slot).encode("utf-8") + b":" + key
+
+
+def _player_count(value: Any) -> int:
+    try:
+        return min(max(0, int(value or 0)), 0xFFFFFFFF)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _pop_key(player_count: Any, rank_b: bytes) -> bytes:
+    return _u32be(0xFFFFFFFF - _player_count(player_count)) + rank_b
+
+
 def _u32be(value: int) -> bytes:
     return int(value).to_bytes(4, byteorder="big", signed=False)
 
@@ -264,6 +557,26 @@ def _u32be_to_int(value: bytes | None) -> int | None:
     return int.from_bytes(value, byteorder="big", signed=False)
 
 
+def _pack_ranks(ranks: list[int]) -> bytes:
+    return b"".join(_u32be(r) for r in ranks)
+
+
+def _unpack_ranks(raw: bytes | None) -> list[int]:
+    if not raw:
+        return []
+    return sorted(int.from_bytes(raw[i : i + 4], byteorder="big", signed=False) for i in range(0, len(raw) - 3, 4))
+
+
+def _delete_entry(dbi, txn, key: bytes, value: bytes | None = None) -> bool:
+    try:
+        dbi.delete(txn, key, value)
+    except MDBXErrorExc as exc:
+        if getattr(exc, "errno", None) == MDBXError.MDBX_NOTFOUND:
+            return False
+        raise
+    return True
+
+
 def _ensure_game_fields(game: dict) -> dict:
     out = dict(game)
     code = str(out.get("code") or "")
@@ -274,96 +587,511 @@ def _ensure_game_fields(game: dict) -> dict:
 
 
 def _iter_tokens_for_game(game: dict) -> set[str]:
-    code = str(game.get("code") or "").strip()
-    name_ru = str(game.get("name_ru") or "")
-    name_en = str(game.get("name_en") or "")
+    _, _, token_sources = _game_search_texts(game)
+
+    return {t for src in token_sources for t in src.split() if len(t) >= 2}
+
+
+class _RankingCache:
+    """LRU of search rankings, bounded by entries and by the total number of candidate codes they hold."""
+
+    def __init__(self, max_entries: int = 256, max_codes: int = 200_000):
+        self.max_entries = max(0, int(max_entries))
+        self.max_codes = max(0, int(max_codes))
+        self._data: OrderedDict[tuple[str, ...], tuple[int, _LazyRanking]] = OrderedDict()
+        self._codes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, ...], generation: int) -> _LazyRanking | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] != generation:
+                self._pop(key)
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple[str, ...], generation: int, ranked: _LazyRanking) -> None:
+        if not self.max_entries or ranked.size > self.max_codes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (generation, ranked)
+            self._codes += ranked.size
+            while self._data and (len(self._data) > self.max_entries or self._codes > self.max_codes):
+                _, (_, evicted) = self._data.popitem(last=False)
+                self._codes -= evicted.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._codes = 0
+
+    def _pop(self, key: tuple[str, ...]) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._codes -= entry[1].size
+
+
+class _LazyRanking:
+    """Search ranking that is only scored as deep as callers read it.
+
+    Unscored candidates wait in a heap keyed by an upper bound of their score; the best scored
+    candidate is emitted once no pending bound can beat it. Candidates whose bound is already
+    exact (every query token found) never go through the fuzzy matchers.
+    """
+
+    def __init__(
+        self,
+        env,
+        maps: _SlotMaps,
+        variants: list[str],
+        matchers: list[Matcher],
+        pending: list[tuple[float, int, int, str]],
+        scored: list[tuple[float, int, int, str]],
+        examined: int = 0,
+    ):
+        self._env = env
+        self._maps = maps
+        self._variants = variants
+        self._matchers = matchers
+        # Heap items are (-score or -bound, -playerCount, candidate order, code).
+        self._pending = pending
+        self._scored = scored
+        heapq.heapify(self._pending)
+        heapq.heapify(self._scored)
+        self._ranked: list[str] = []
+        self._lock = threading.Lock()
+        self.size = len(pending) + len(scored)
+        # Games pulled from the index for this query, and how many of them needed a fuzzy score so far.
+        self.examined = examined
+        self.fuzzy_scored = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return not self._pending and not self._scored
+
+    def total(self) -> int:
+        """Number of matches; exact once exhausted, an upper estimate before that."""
+        return len(self._ranked) + len(self._scored) + len(self._pending)
+
+    def take(self, n: int, cancel: threading.Event | None = None) -> list[str]:
+        with self._lock:
+            if len(self._ranked) < n and not self.exhausted:
+                self._extend(n, cancel)
+            return self._ranked[:n]
+
+    def _extend(self, n: int, cancel: threading.Event | None) -> None:
+        pending, scored = self._pending, self._scored
+        checked = 0
+        with self._env.ro_transaction() as txn:
+            while len(self._ranked) < n:
+                while pending and (not scored or pending[0] < scored[0]):
+                    checked += 1
+                    if cancel is not None and checked % 256 == 0 and cancel.is_set():
+                        raise SearchSuperseded()
+                    _, neg_pop, seq, code_s = heapq.heappop(pending)
+                    texts = _read_search_texts(txn, self._maps, code_s.encode("utf-8"))
+                    if texts is None:
+                        continue
+                    self.fuzzy_scored += 1
+                    _, hay, hay_lat, targets = texts
+                    score = _signature_match_score(hay, hay_lat, targets, self._variants, self._matchers)
+                    if score >= _MATCH_CUTOFF:
+                        heapq.heappush(scored, (-score, neg_pop, seq, code_s))
+                if not scored:
+                    break
+                self._ranked.append(heapq.heappop(scored)[3])
 
-    rus_ru = _rusify_mixed_text(name_ru)
-    rus_en = _rusify_mixed_text(name_en)
 
-    token_sources = [
-        _norm(code),
-        _norm(name_ru),
-        _norm(name_en),
-        _norm(rus_ru),
-        _norm(rus_en),
-        _norm(_translit_ru_to_lat(name_ru)),
-        _norm(_translit_ru_to_lat(name_en)),
-        _norm(_translit_ru_to_lat(rus_ru)),
-        _norm(_translit_ru_to_lat(rus_en)),
-    ]
+_GAME_VIEW_KEYS = ("code", "name_ru", "name_en", "playerCount")
 
-    tokens: set[str] = set()
-    for src in token_sources:
-        for t in src.split():
-            if len(t) < 2:
-                continue
-            tokens.add(t)
-            if len(t) >= 3:
-                for n in range(3, min(len(t), 8) + 1):
-                    tokens.add(t[:n])
-    return tokens
+
+class GameView(Mapping):
+    """Read-only game row of a catalog snapshot."""
+
+    __slots__ = ("_snap", "_i")
+
+    def __init__(self, snap: _CatalogSnapshot, i: int):
+        self._snap = snap
+        self._i = i
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "code":
+            return self._snap.codes[self._i]
+        if key == "name_ru":
+            return self._snap.names_ru[self._i]
+        if key == "name_en":
+            return self._snap.names_en[self._i]
+        if key == "playerCount":
+            return self._snap.players[self._i]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_GAME_VIEW_KEYS)
+
+    def __len__(self) -> int:
+        return len(_GAME_VIEW_KEYS)
+
+    def __repr__(self) -> str:
+        return f"GameView({dict(self)!r})"
+
+
+class _CatalogSnapshot:
+    """Compact in-memory copy of the catalog's display fields and Russian labels.
+
+    A published snapshot is never mutated: changes build a new one and replace the reference.
+    """
+
+    __slots__ = ("codes", "names_ru", "names_en", "labels_ru", "players", "index", "_words", "_word_rows", "_words_lock")
+
+    def __init__(self) -> None:
+        self.codes: list[str] = []
+        self.names_ru: list[str] = []
+        self.names_en: list[str] = []
+        self.labels_ru: list[str] = []
+        self.players = array("L")
+        self.index: dict[str, int] = {}
+        self._words: list[str] | None = None
+        self._word_rows = array("L")
+        self._words_lock = threading.Lock()
+
+    def append(self, game: dict, label_ru: str | None = None) -> None:
+        code = sys.intern(str(game["code"]))
+        if code in self.index:
+            return
+        name_ru = str(game.get("name_ru") or code)
+        if label_ru is None:
+            label_ru = display_name(game, "ru")
+        self.index[code] = len(self.codes)
+        self.codes.append(code)
+        self.names_ru.append(name_ru)
+        self.names_en.append(str(game.get("name_en") or code))
+        # Most Russian names have nothing to rusify; share the string instead of holding a copy.
+        self.labels_ru.append(name_ru if label_ru == name_ru else label_ru)
+        self.players.append(_player_count(game.get("playerCount")))
+
+    def without(self, code: str) -> _CatalogSnapshot:
+        snap = _CatalogSnapshot()
+        i = self.index.get(code)
+        if i is None:
+            i = len(self.codes)
+        snap.codes = self.codes[:i] + self.codes[i + 1 :]
+        snap.names_ru = self.names_ru[:i] + self.names_ru[i + 1 :]
+        snap.names_en = self.names_en[:i] + self.names_en[i + 1 :]
+        snap.labels_ru = self.labels_ru[:i] + self.labels_ru[i + 1 :]
+        snap.players = self.players[:i] + self.players[i + 1 :]
+        snap.index = {c: j for j, c in enumerate(snap.codes)}
+        return snap
+
+    def with_game(self, game: dict) -> _CatalogSnapshot:
+        snap = self._copy()
+        snap.append(game)
+        return snap
+
+    def with_players(self, counts: Mapping[str, int]) -> _CatalogSnapshot:
+        snap = self._copy()
+        for code, n in counts.items():
+            i = snap.index.get(code)
+            if i is not None:
+                snap.players[i] = _player_count(n)
+        return snap
+
+    def _copy(self) -> _CatalogSnapshot:
+        snap = _CatalogSnapshot()
+        snap.codes = list(self.codes)
+        snap.names_ru = list(self.names_ru)
+        snap.names_en = list(self.names_en)
+        snap.labels_ru = list(self.labels_ru)
+        snap.players = array("L", self.players)
+        snap.index = dict(self.index)
+        return snap
+
+    def view(self, code: str) -> GameView | None:
+        i = self.index.get(code)
+        return None if i is None else GameView(self, i)
+
+    def label(self, code: str, lang: str) -> str | None:
+        i = self.index.get(code)
+        if i is None:
+            return None
+        return self.names_en[i] if lang == "en" else self.labels_ru[i]
+
+    def rows_with_prefix(self, prefix: str) -> array:
+        """Rows having an indexed token (any spelling of a name word, or the code) that starts with prefix.
+
+        Like the token map, prefixes shorter than _MIN_PREFIX_LEN bytes only match whole tokens.
+        """
+        if self._words is None:
+            self._build_words()
+        assert self._words is not None
+        lo = bisect.bisect_left(self._words, prefix)
+        if len(prefix.encode("utf-8")) < _MIN_PREFIX_LEN:
+            hi = bisect.bisect_right(self._words, prefix, lo)
+        else:
+            hi = bisect.bisect_left(self._words, prefix + "\U0010ffff", lo)
+        return self._word_rows[lo:hi]
+
+    def _build_words(self) -> None:
+        # Built on first use; the snapshot is otherwise immutable, so the lock only guards this step.
+        with self._words_lock:
+            if self._words is not None:
+                return
+            # Same tokens as the MDBX token map, so suggest() answers alike with or without the snapshot.
+            pairs = sorted(
+                (w, i)
+                for i in range(len(self.codes))
+                for w in _iter_tokens_for_game(
+                    {"code": self.codes[i], "name_ru": self.names_ru[i], "name_en": self.names_en[i]}
+                )
+            )
+            self._word_rows = array("L", (i for _, i in pairs))
+            self._words = [w for w, _ in pairs]
+
+
+class SearchSuperseded(Exception):
+    """Raised for a catalog query replaced by a newer one from the same owner."""
+
+
+class _RankGaps:
+    """Sorted ranks hidden from a listing: removal holes plus the ranks of excluded games.
+
+    pop_marks holds the pop key of every _POP_MARK_EVERY-th visible game in popularity order,
+    filled in as pages are read, so order="popular" seeks close to the offset too.
+    """
+
+    __slots__ = ("excluded", "_shifted", "pop_marks")
+
+    def __init__(self, ranks: list[int], excluded: int = 0):
+        self.excluded = excluded
+        self.pop_marks: list[bytes] = []
+        # ranks[i] - i is non-decreasing: the number of visible ranks before each hidden one.
+        self._shifted = [r - i for i, r in enumerate(ranks)]
+
+    def rank_for_offset(self, offset: int) -> int:
+        return offset + bisect.bisect_right(self._shifted, offset)
+
+
+class _SlotMaps:
+    """Map handles of one catalog slot; readers take a reference once so a swap can't mix slots."""
+
+    __slots__ = ("slot", "games", "sig", "order", "rank", "token", "df", "pop", "gram")
+
+    def __init__(self, slot: int, games, sig, order, rank, token, df, pop, gram):
+        self.slot = slot
+        self.games = games
+        self.sig = sig
+        self.order = order
+        self.rank = rank
+        self.token = token
+        self.df = df
+        self.pop = pop
+        self.gram = gram
+
+    def all(self) -> tuple:
+        return (self.games, self.sig, self.order, self.rank, self.token, self.df, self.pop, self.gram)
 
 
 class GamesService:
-    def __init__(self, mdbx_path: str = "data/games.mdbx"):
+    def __init__(
+        self,
+        mdbx_path: str = "data/games.mdbx",
+        similarity: str = "lcs",
+        workers: int = 4,
+        cache_size: int = 256,
+        snapshot: bool = True,
+        readonly: bool = False,
+        refresh_interval: float = 2.0,
+    ):
         self.mdbx_path = Path(mdbx_path)
+        self._readonly = bool(readonly)
+        self._refresh_interval = max(0.0, float(refresh_interval))
+        self._next_refresh = 0.0
+        self._seen_generation: bytes | None = None
+        # Reentrant: load() may run import_stream, whose writer checks pass through _ensure_loaded again.
+        self._reload_lock = threading.RLock()
+        self._writer_fd: int | None = None
+        self._loaded = False
+        self._loading = False
+        self._similarity = get_similarity_engine(similarity)
+        self._workers = max(1, int(workers))
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._inflight: dict[Hashable, threading.Event] = {}
+        self._generation: int = 0
+        self._ranking_cache = _RankingCache(max_entries=cache_size)
+        self._use_snapshot = bool(snapshot)
+        self._snapshot: _CatalogSnapshot | None = None
 
         self._env: Env | None = None
         self._meta = None
-        self._games = None
-        self._order = None
-        self._rank = None
-        self._token = None
+        self._maps: _SlotMaps | None = None
 
         self._count: int = 0
-        self._cache_by_code: dict[str, dict] = {}
-
-        self.load()
-
-    def load(self) -> None:
+        self._next_rank: int = 0
+        self._holes: list[int] = []
+        self._gaps: OrderedDict[tuple[int, frozenset[str]], _RankGaps] = OrderedDict()
+        self._gaps_lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def readonly(self) -> bool:
+        return self._readonly
+
+    def _bump_generation(self) -> None:
+        self._generation += 1
+        self._ranking_cache.clear()
+        with self._gaps_lock:
+            self._gaps.clear()
+
+    def load(self) -> dict[str, float]:
+        """(Re)open the catalog, migrating it if needed; returns seconds spent per step."""
         if not _HAS_MDBX or Env is None:
             raise RuntimeError("libmdbx is not available")
-        self._cache_by_code = {}
-
+        with self._reload_lock:
+            self._loading = True
+            try:
+                return self._load()
+            except BaseException:
+                # Forget the half-opened maps, so the next use loads again instead of serving them.
+                self._meta = self._maps = None
+                self._loaded = False
+                raise
+            finally:
+                self._loading = False
+
+    def _load(self) -> dict[str, float]:
+        timings: dict[str, float] = {}
+
+        started = time.perf_counter()
         if self._env is None:
             self._open_mdbx()
-        self._open_maps()
-        self._ensure_schema()
-        self._count = self._read_count()
+        maps = self._open_maps()
+        timings["open"] = time.perf_counter() - started
+
+        # Queries keep using the current state until everything below is read, then it is swapped at once.
+        started = time.perf_counter()
+        maps = self._ensure_schema(maps)
+        generation = self._meta_get(b"generation")
+        count, holes, next_rank = self._read_slot_stats(maps)
+        timings["schema"] = time.perf_counter() - started
+
+        snap: _CatalogSnapshot | None = None
+        if self._use_snapshot:
+            started = time.perf_counter()
+            snap = _CatalogSnapshot()
+            for raw in self._iter_records(maps=maps):
+                game = _decode_game(raw, extras=False)
+                if game is not None:
+                    snap.append(game, _decode_label(raw, "ru"))
+            timings["snapshot"] = time.perf_counter() - started
+
+        self._seen_generation = generation
+        self._maps = maps
+        self._count = count
+        self._holes = holes
+        self._next_rank = next_rank
+        self._snapshot = snap
+        # After the swap, so nothing gets cached under the new generation from the old maps.
+        self._bump_generation()
+        self._loaded = True
+        return timings
+
+    def _ensure_loaded(self) -> None:
+        # The catalog opens on first use, not at import; a migrating load() passes through here again.
+        if self._loaded:
+            return
+        with self._reload_lock:
+            if not self._loaded and not self._loading:
+                self.load()
+
+    def warmup(self) -> dict[str, float]:
+        """Open the catalog and build the lazily built indexes now instead of on the first request."""
+        timings: dict[str, float] = {}
+        with self._reload_lock:
+            if not self._loaded:
+                timings.update(self.load())
+        snap = self._snapshot
+        if snap is not None:
+            started = time.perf_counter()
+            snap.rows_with_prefix("")
+            timings["words"] = time.perf_counter() - started
+        return timings
 
     def _open_mdbx(self) -> None:
         assert Env is not None and MDBXEnvFlags is not None
         self.mdbx_path.parent.mkdir(parents=True, exist_ok=True)
         flags = MDBXEnvFlags.MDBX_ENV_DEFAULTS | MDBXEnvFlags.MDBX_NOSUBDIR
+        if self._readonly:
+            flags |= MDBXEnvFlags.MDBX_RDONLY
         self._env = Env(
             str(self.mdbx_path),
             flags=flags,
             maxreaders=64,
-            maxdbs=16,
+            maxdbs=32,
         )
 
     def _close_mdbx(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
         if self._env is not None:
             try:
                 self._env.close()
             except Exception:
                 pass
         self._env = None
-        self._meta = self._games = self._order = self._rank = self._token = None
+        self._meta = self._maps = None
+        self._loaded = False
 
-    def _open_maps(self) -> None:
+    def _open_maps(self) -> _SlotMaps:
+        """Open meta and return the maps of the active slot; the caller decides when to switch to them."""
         assert self._env is not None and MDBXDBFlags is not None
+        if self._readonly:
+            try:
+                with self._env.ro_transaction() as txn:
+                    self._meta = txn.open_map(MDBX_MAP_META, MDBXDBFlags.MDBX_DB_ACCEDE)
+                    slot = 1 if self._meta.get(txn, b"slot") == b"1" else 0
+                    return self._open_slot_maps(txn, slot)
+            except MDBXErrorExc as e:
+                raise RuntimeError(f"{self.mdbx_path} has no games catalog yet; run a writer first") from e
         with self._env.rw_transaction() as txn:
             self._meta = txn.open_map(MDBX_MAP_META, MDBXDBFlags.MDBX_CREATE)
-            self._games = txn.open_map(MDBX_MAP_GAMES, MDBXDBFlags.MDBX_CREATE)
-            self._order = txn.open_map(MDBX_MAP_ORDER, MDBXDBFlags.MDBX_CREATE)
-            self._rank = txn.open_map(MDBX_MAP_RANK, MDBXDBFlags.MDBX_CREATE)
-            self._token = txn.open_map(
-                MDBX_MAP_TOKEN,
-                MDBXDBFlags.MDBX_CREATE | MDBXDBFlags.MDBX_DUPSORT,
-            )
+            slot_raw = self._meta.get(txn, b"slot")
+            slot = 1 if slot_raw == b"1" else 0
+            maps = self._open_slot_maps(txn, slot)
             txn.commit()
+        return maps
+
+    def _open_slot_maps(self, txn, slot: int) -> _SlotMaps:
+        assert MDBXDBFlags is not None
+        # A reader accepts the stored flags (token is dupsort) instead of creating maps.
+        create = MDBXDBFlags.MDBX_DB_ACCEDE if self._readonly else MDBXDBFlags.MDBX_CREATE
+        dupsort = create if self._readonly else create | MDBXDBFlags.MDBX_DUPSORT
+        return _SlotMaps(
+            slot,
+            games=txn.open_map(_slot_map_name(MDBX_MAP_GAMES, slot), create),
+            sig=txn.open_map(_slot_map_name(MDBX_MAP_SIG, slot), create),
+            order=txn.open_map(_slot_map_name(MDBX_MAP_ORDER, slot), create),
+            rank=txn.open_map(_slot_map_name(MDBX_MAP_RANK, slot), create),
+            token=txn.open_map(_slot_map_name(MDBX_MAP_TOKEN, slot), dupsort),
+            df=txn.open_map(_slot_map_name(MDBX_MAP_DF, slot), create),
+            pop=txn.open_map(_slot_map_name(MDBX_MAP_POP, slot), create),
+            gram=txn.open_map(_slot_map_name(MDBX_MAP_GRAM, slot), dupsort),
+        )
+
+    def _require_maps(self) -> _SlotMaps:
+        self._ensure_loaded()
+        maps = self._maps
+        if not self._env or not self._meta or maps is None:
+            raise RuntimeError("MDBX is not initialized")
+        return maps
 
     def _meta_get(self, key: bytes) -> bytes | None:
         if not self._env or not self._meta:
@@ -375,98 +1103,268 @@ class GamesService:
         assert self._meta is not None and MDBXPutFlags is not None
         self._meta.put(txn, key, value, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
 
-    def _ensure_schema(self) -> None:
+    def _slot_meta_get(self, key: bytes, maps: _SlotMaps | None = None) -> bytes | None:
+        maps = maps or self._maps
+        if maps is None:
+            return None
+        return self._meta_get(_slot_meta_key(key, maps.slot))
+
+    def _slot_meta_set(self, txn, slot: int, key: bytes, value: bytes) -> None:
+        self._meta_set(txn, _slot_meta_key(key, slot), value)
+
+    def _next_stored_generation(self, txn) -> bytes | None:
+        """Bump meta["generation"] in a write transaction.
+
+        Returns the new value, or None when another process wrote since our last load: the caller
+        then leaves _seen_generation stale so the next refresh() picks those changes up.
+        """
+        assert self._meta is not None
+        raw = self._meta.get(txn, b"generation")
+        try:
+            value = str(int(raw or b"0") + 1).encode("utf-8")
+        except ValueError:
+            value = b"1"
+        self._meta_set(txn, b"generation", value)
+        return value if raw == self._seen_generation else None
+
+    @contextmanager
+    def _writer_lock(self, wait: bool = True) -> Iterator[bool]:
+        """Exclusive catalog writer, reentrant within this process; yields False if wait=False and it is taken.
+
+        Across processes it is an flock on <catalog>.writer, so a script import and the bot's own writes
+        never fill the inactive slot at the same time.
+        """
+        if self._readonly:
+            raise RuntimeError("GamesService is opened read-only; catalog writes belong to the writer process")
+        with self._reload_lock:
+            if self._writer_fd is not None:
+                yield True
+                return
+            self.mdbx_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(f"{self.mdbx_path}.writer", os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                yield False
+                return
+            self._writer_fd = fd
+            try:
+                yield True
+            finally:
+                self._writer_fd = None
+                os.close(fd)
+
+    @contextmanager
+    def _writing(self) -> Iterator[_SlotMaps]:
+        """Hold the writer lock and yield the active slot, reloaded first if another writer changed it."""
+        with self._writer_lock():
+            self.refresh(force=True)
+            yield self._require_maps()
+
+    def refresh(self, force: bool = False) -> bool:
+        """Reload if another process changed the catalog; polls meta at most once per refresh_interval."""
+        self._ensure_loaded()
+        now = time.monotonic()
+        if not force and now < self._next_refresh:
+            return False
+        self._next_refresh = now + self._refresh_interval
+        if self._meta_get(b"generation") == self._seen_generation:
+            return False
+        with self._reload_lock:
+            if self._meta_get(b"generation") == self._seen_generation:
+                return False
+            self.load()
+        return True
+
+    def _ensure_schema(self, maps: _SlotMaps) -> _SlotMaps:
+        """The maps to load: these, or the freshly migrated slot if the stored schema is outdated."""
         if not self._env or not self._meta:
-            return
+            return maps
         schema_raw = self._meta_get(b"schema")
         if schema_raw == str(MDBX_SCHEMA_VERSION).encode("utf-8"):
-            return
-
-        games = self._read_all_games_in_order()
-        self.rebuild(games)
-
-    def _read_count(self) -> int:
-        raw = self._meta_get(b"count") or b"0"
+            return maps
+        if self._readonly:
+            raise RuntimeError(f"{self.mdbx_path} has schema {schema_raw!r}, expected {MDBX_SCHEMA_VERSION}; run a writer to migrate")
+
+        # import_stream reads the old slot through self._maps and swaps in the new one itself.
+        self._maps = maps
+        self._seen_generation = self._meta_get(b"generation")
+        self.import_stream(self.iter_games())
+        assert self._maps is not None
+        return self._maps
+
+    def _read_slot_stats(self, maps: _SlotMaps) -> tuple[int, list[int], int]:
+        """count, holes and next_rank of the slot behind maps."""
+        holes = _unpack_ranks(self._slot_meta_get(b"holes", maps))
+        return self._read_count(maps), holes, self._read_next_rank(maps)
+
+    def _read_count(self, maps: _SlotMaps) -> int:
+        raw = self._slot_meta_get(b"count", maps) or b"0"
         try:
             return int(raw.decode("utf-8"))
         except Exception:
-            return self._count_entries()
+            return self._count_entries(maps)
+
+    def _read_next_rank(self, maps: _SlotMaps) -> int:
+        raw = self._slot_meta_get(b"next_rank", maps)
+        if raw:
+            try:
+                return int(raw.decode("utf-8"))
+            except Exception:
+                pass
+        if not self._env:
+            return 0
+        with self._env.ro_transaction() as txn:
+            with Cursor(maps.order, txn) as cur:  # type: ignore[arg-type]
+                k, _ = cur.get_full(None, MDBXCursorOp.MDBX_LAST)  # type: ignore[arg-type]
+        last = _u32be_to_int(k)
+        return 0 if last is None else last + 1
 
-    def _count_entries(self) -> int:
-        if not self._env or not self._order:
+    def _count_entries(self, maps: _SlotMaps) -> int:
+        if not self._env:
             return 0
         total = 0
         with self._env.ro_transaction() as txn:
-            with Cursor(self._order, txn) as cur:  # type: ignore[arg-type]
+            with Cursor(maps.order, txn) as cur:  # type: ignore[arg-type]
                 k, v = cur.get_full(_u32be(0), MDBXCursorOp.MDBX_SET_RANGE)  # type: ignore[arg-type]
                 while v is not None:
                     total += 1
                     k, v = cur.get_full(None, MDBXCursorOp.MDBX_NEXT)  # type: ignore[arg-type]
         return total
 
-    def _fetch_game_from_mdbx(self, txn, code_b: bytes) -> dict | None:
-        assert self._games is not None
-        raw = self._games.get(txn, code_b)
+    def _fetch_game_from_mdbx(
+        self,
+        txn,
+        code_b: bytes,
+        maps: _SlotMaps | None = None,
+        extras: bool = True,
+    ) -> dict | None:
+        maps = maps or self._maps
+        assert maps is not None
+        raw = maps.games.get(txn, code_b)
         if not raw:
             return None
-        try:
-            obj = json.loads(raw.decode("utf-8"))
-            if isinstance(obj, dict):
-                return _ensure_game_fields(obj)
-        except Exception:
-            return None
-        return None
-
-    def _read_all_games_in_order(self) -> list[dict]:
-        if not self._env or not self._order or not self._games:
-            return []
-        out: list[dict] = []
-        with self._env.ro_transaction() as txn:
-            with Cursor(self._order, txn) as cur:  # type: ignore[arg-type]
-                k, v = cur.get_full(_u32be(0), MDBXCursorOp.MDBX_SET_RANGE)  # type: ignore[arg-type]
-                while v is not None:
-                    game = self._fetch_game_from_mdbx(txn, v)
-                    if game is not None:
-                        out.append(game)
-                    k, v = cur.get_full(None, MDBXCursorOp.MDBX_NEXT)  # type: ignore[arg-type]
-        return out
-
-    def rebuild(self, games: list[dict]) -> None:
-        if not self._env or not self._meta or not self._games or not self._order or not self._rank or not self._token:
-            raise RuntimeError("MDBX is not initialized")
-
-        normalized = [_ensure_game_fields(g) for g in games if isinstance(g, dict)]
+        return _decode_game(raw, extras=extras)
+
+    def iter_games(self, batch_size: int = 500) -> Iterator[dict]:
+        self._ensure_loaded()
+        for raw in self._iter_records(batch_size):
+            game = _decode_game(raw)
+            if game is not None:
+                yield game
+
+    def _iter_records(self, batch_size: int = 500, maps: _SlotMaps | None = None) -> Iterator[bytes]:
+        # Reads in short transactions so a caller may write (e.g. import_stream) between batches.
+        batch_size = max(1, int(batch_size))
+        maps = maps or self._maps
+        if not self._env or maps is None:
+            return
+        start_rank = 0
+        while True:
+            chunk: list[bytes] = []
+            with self._env.ro_transaction() as txn:
+                with Cursor(maps.order, txn) as cur:  # type: ignore[arg-type]
+                    k, v = cur.get_full(_u32be(start_rank), MDBXCursorOp.MDBX_SET_RANGE)  # type: ignore[arg-type]
+                    while v is not None and len(chunk) < batch_size:
+                        rank = _u32be_to_int(k)
+                        if rank is not None:
+                            start_rank = rank + 1
+                        raw = maps.games.get(txn, v)
+                        if raw:
+                            chunk.append(raw)
+                        k, v = cur.get_full(None, MDBXCursorOp.MDBX_NEXT)  # type: ignore[arg-type]
+                    exhausted = v is None
+            yield from chunk
+            if exhausted:
+                return
+
+    def rebuild(self, games: Iterable[dict]) -> None:
+        self.import_stream(games)
+
+    def import_stream(self, games: Iterable[dict], batch_size: int = 1000) -> int:
+        """Load a full catalog into the inactive slot in chunked transactions, then switch slots.
+
+        Readers keep using the active slot until the final commit flips meta["slot"].
+        """
+        with self._writing() as active:
+            assert self._env is not None and MDBXPutFlags is not None
+            batch_size = max(1, int(batch_size))
+            slot = 1 - active.slot
+
+            with self._env.rw_transaction() as txn:
+                shadow = self._open_slot_maps(txn, slot)
+                for dbi in shadow.all():
+                    dbi.drop(txn, delete=False)
+                for key in _SLOT_META_KEYS:
+                    _delete_entry(self._meta, txn, _slot_meta_key(key, slot))
+                txn.commit()
+
+            count = 0
+            batch: list[dict] = []
+            snap = _CatalogSnapshot() if self._use_snapshot else None
+            for g in games:
+                if not isinstance(g, dict):
+                    continue
+                game = _ensure_game_fields(g)
+                if not game["code"]:
+                    continue
+                batch.append(game)
+                if snap is not None:
+                    snap.append(game)
+                if len(batch) >= batch_size:
+                    count = self._write_import_batch(shadow, batch, count)
+                    batch = []
+            if batch:
+                count = self._write_import_batch(shadow, batch, count)
+
+            with self._env.rw_transaction() as txn:
+                self._slot_meta_set(txn, slot, b"count", str(count).encode("utf-8"))
+                self._slot_meta_set(txn, slot, b"next_rank", str(count).encode("utf-8"))
+                self._meta_set(txn, b"schema", str(MDBX_SCHEMA_VERSION).encode("utf-8"))
+                self._meta_set(txn, b"slot", str(slot).encode("utf-8"))
+                generation = self._next_stored_generation(txn)
+                txn.commit()
+
+            self._seen_generation = generation
+
+            self._maps = shadow
+            self._snapshot = snap
+            self._count = count
+            self._next_rank = count
+            self._holes = []
+            self._bump_generation()
+            return count
+
+    def _write_import_batch(self, maps: _SlotMaps, games: list[dict], rank: int) -> int:
+        assert self._env is not None
         with self._env.rw_transaction() as txn:
-            self._games.drop(txn, delete=False)
-            self._order.drop(txn, delete=False)
-            self._rank.drop(txn, delete=False)
-            self._token.drop(txn, delete=False)
-            self._meta.drop(txn, delete=False)
-
-            for rank, game in enumerate(normalized):
-                code = str(game.get("code") or "")
-                if not code:
+            df: Counter[str] = Counter()
+            for game in games:
+                code_b = game["code"].encode("utf-8")
+                if maps.rank.get(txn, code_b) is not None:
                     continue
-                code_b = code.encode("utf-8")
-                rank_b = _u32be(rank)
-
-                game_json = json.dumps(game, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
-                self._games.put(txn, code_b, game_json, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
-                self._order.put(txn, rank_b, code_b, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
-                self._rank.put(txn, code_b, rank_b, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
-
-                for token in _iter_tokens_for_game(game):
-                    token_b = token.encode("utf-8")
-                    self._token.put(txn, token_b, rank_b + code_b, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
-
-            self._meta_set(txn, b"schema", str(MDBX_SCHEMA_VERSION).encode("utf-8"))
-            self._meta_set(txn, b"count", str(len(normalized)).encode("utf-8"))
+                df.update(self._put_game(txn, maps, game, _u32be(rank)))
+                rank += 1
+            _update_df(txn, maps, df)
             txn.commit()
-
-        self._cache_by_code = {}
-        self._count = len(normalized)
+        return rank
+
+    def _put_game(self, txn, maps: _SlotMaps, game: dict, rank_b: bytes) -> set[str]:
+        code_b = game["code"].encode("utf-8")
+        maps.games.put(txn, code_b, _encode_game(game), flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
+        maps.sig.put(txn, code_b, _encode_signature(game), flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
+        maps.order.put(txn, rank_b, code_b, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
+        maps.rank.put(txn, code_b, rank_b, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
+        maps.pop.put(txn, _pop_key(game.get("playerCount"), rank_b), code_b, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
+        tokens = _iter_tokens_for_game(game)
+        for token in tokens:
+            maps.token.put(txn, token.encode("utf-8"), rank_b + code_b, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
+        return tokens
 
     def count(self) -> int:
+        self._ensure_loaded()
         return int(self._count)
 
     def list(self, limit: int | None = None, offset: int = 0) -> list[dict]:
@@ -474,97 +1372,172 @@ class GamesService:
         if limit is not None:
             limit = max(0, int(limit))
 
-        if not self._env or not self._order:
+        self._ensure_loaded()
+        maps = self._maps
+        if not self._env or maps is None:
             return []
         if limit == 0:
             return []
 
+        start_rank = self._rank_gaps(maps).rank_for_offset(offset)
         out: list[dict] = []
         with self._env.ro_transaction() as txn:
-            assert self._games is not None
-            with Cursor(self._order, txn) as cur:  # type: ignore[arg-type]
-                k, v = cur.get_full(_u32be(offset), MDBXCursorOp.MDBX_SET_RANGE)  # type: ignore[arg-type]
+            with Cursor(maps.order, txn) as cur:  # type: ignore[arg-type]
+                k, v = cur.get_full(_u32be(start_rank), MDBXCursorOp.MDBX_SET_RANGE)  # type: ignore[arg-type]
                 while v is not None and (limit is None or len(out) < limit):
-                    game = self._fetch_game_from_mdbx(txn, v)
+                    game = self._fetch_game_from_mdbx(txn, v, maps)
                     if game is not None:
                         out.append(game)
                     k, v = cur.get_full(None, MDBXCursorOp.MDBX_NEXT)  # type: ignore[arg-type]
         return out
 
-    def get(self, code: str) -> dict | None:
+    def get(self, code: str) -> Mapping[str, Any] | None:
+        """Read-only record of a game; served from the snapshot when it is enabled."""
         code = str(code or "").strip()
         if not code:
             return None
 
-        cached = self._cache_by_code.get(code)
-        if cached is not None:
-            return dict(cached)
+        self._ensure_loaded()
+        snap = self._snapshot
+        if snap is not None:
+            return snap.view(code)
 
-        if not self._env or not self._games:
+        maps = self._maps
+        if not self._env or maps is None:
             return None
-        code_b = code.encode("utf-8")
         with self._env.ro_transaction() as txn:
-            g = self._fetch_game_from_mdbx(txn, code_b)
-        if g is None:
-            return None
-        self._cache_by_code[code] = dict(g)
-        return dict(g)
+            g = self._fetch_game_from_mdbx(txn, code.encode("utf-8"), maps, extras=False)
+        return None if g is None else MappingProxyType(g)
 
     def label(self, code: str, lang: str) -> str:
-        game = self.get(code)
-        if not game:
-            return code
-        name = str(game.get("name_en") if lang == "en" else game.get("name_ru"))
-        return name if lang == "en" else _rusify_mixed_text(name)
-
-    def labels(self, codes: list[str], lang: str) -> list[str]:
-        return [self.label(c, lang) for c in codes]
+        return self.labels([code], lang)[0]
+
+    def labels(self, codes: Iterable[str], lang: str) -> list[str]:
+        """Display labels in the order of codes, read in one pass; unknown codes label themselves."""
+        codes = [str(c or "").strip() for c in codes]
+        self._ensure_loaded()
+        snap = self._snapshot
+        if snap is not None:
+            return [snap.label(c, lang) or c for c in codes]
+
+        maps = self._maps
+        if not self._env or maps is None or not codes:
+            return codes
+        out: list[str] = []
+        with self._env.ro_transaction() as txn:
+            for code in codes:
+                raw = maps.games.get(txn, code.encode("utf-8")) if code else None
+                out.append((_decode_label(raw, lang) if raw else None) or code)
+        return out
 
     def add(self, code: str, name_ru: str, name_en: str) -> None:
         code = str(code or "").strip()
         if not code or self.get(code):
             return
 
-        if not self._env or not self._meta or not self._games or not self._order or not self._rank or not self._token:
-            raise RuntimeError("MDBX is not initialized")
-
-        rank = int(self._count)
-        code_b = code.encode("utf-8")
-        rank_b = _u32be(rank)
-        game = _ensure_game_fields({"code": code, "name_ru": name_ru, "name_en": name_en, "playerCount": 0})
-        game_json = json.dumps(game, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
-
-        with self._env.rw_transaction() as txn:
-            self._games.put(txn, code_b, game_json, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
-            self._order.put(txn, rank_b, code_b, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
-            self._rank.put(txn, code_b, rank_b, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
-            for token in _iter_tokens_for_game(game):
-                self._token.put(txn, token.encode("utf-8"), rank_b + code_b, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
-            self._meta_set(txn, b"schema", str(MDBX_SCHEMA_VERSION).encode("utf-8"))
-            self._meta_set(txn, b"count", str(rank + 1).encode("utf-8"))
-            txn.commit()
-
-        self._count = rank + 1
-        self._cache_by_code[code] = dict(game)
+        with self._writing() as maps:
+            assert self._env is not None
+            rank = int(self._next_rank)
+            count = int(self._count) + 1
+            game = _ensure_game_fields({"code": code, "name_ru": name_ru, "name_en": name_en, "playerCount": 0})
+
+            with self._env.rw_transaction() as txn:
+                _update_df(txn, maps, Counter(self._put_game(txn, maps, game, _u32be(rank))))
+                self._meta_set(txn, b"schema", str(MDBX_SCHEMA_VERSION).encode("utf-8"))
+                self._slot_meta_set(txn, maps.slot, b"count", str(count).encode("utf-8"))
+                self._slot_meta_set(txn, maps.slot, b"next_rank", str(rank + 1).encode("utf-8"))
+                generation = self._next_stored_generation(txn)
+                txn.commit()
+
+            self._seen_generation = generation
+            self._count = count
+            self._next_rank = rank + 1
+            if self._snapshot is not None:
+                self._snapshot = self._snapshot.with_game(game)
+            self._bump_generation()
 
     def remove(self, code: str) -> bool:
         code = str(code or "").strip()
         if not code:
             return False
-        if self.get(code) is None:
-            return False
+        with self._writing() as maps:
+            assert self._env is not None
+
+            code_b = code.encode("utf-8")
+            with self._env.rw_transaction() as txn:
+                rank = _u32be_to_int(maps.rank.get(txn, code_b))
+                game = self._fetch_game_from_mdbx(txn, code_b, maps, extras=False)
+                if rank is None or game is None:
+                    return False
+                rank_b = _u32be(rank)
 
-        games = [g for g in self.list() if str(g.get("code") or "") != code]
-        self.rebuild(games)
-        self._cache_by_code.pop(code, None)
+                df: Counter[str] = Counter()
+                for token in _iter_tokens_for_game(game):
+                    if _delete_entry(maps.token, txn, token.encode("utf-8"), rank_b + code_b):
+                        df[token] -= 1
+                _update_df(txn, maps, df)
+                _delete_entry(maps.games, txn, code_b)
+                _delete_entry(maps.sig, txn, code_b)
+                _delete_entry(maps.rank, txn, code_b)
+                _delete_entry(maps.order, txn, rank_b)
+                _delete_entry(maps.pop, txn, _pop_key(game.get("playerCount"), rank_b))
+
+                holes = list(self._holes)
+                bisect.insort(holes, rank)
+                count = max(0, int(self._count) - 1)
+                self._slot_meta_set(txn, maps.slot, b"holes", _pack_ranks(holes))
+                self._slot_meta_set(txn, maps.slot, b"count", str(count).encode("utf-8"))
+                generation = self._next_stored_generation(txn)
+                txn.commit()
+
+            self._seen_generation = generation
+            self._holes = holes
+            self._count = count
+            if self._snapshot is not None:
+                self._snapshot = self._snapshot.without(code)
+            self._bump_generation()
+
+        if len(holes) > max(_MIN_RANK_HOLES_TO_COMPACT, count // 16):
+            # A full re-import takes a while; whoever removed the game should not wait for it.
+            self._get_executor().submit(self._compact)
         return True
 
-    def page(self, page: int, page_size: int, exclude_codes: set[str] | None = None) -> tuple[list[dict], int]:
+    def _compact(self) -> None:
+        """Re-import the catalog to drop rank holes, unless another writer is busy or already did."""
+        with self._writer_lock(wait=False) as locked:
+            # Another process is writing (maybe importing a fresh catalog); the next remove() tries again.
+            if not locked:
+                return
+            try:
+                self.refresh(force=True)
+                if len(self._holes) > max(_MIN_RANK_HOLES_TO_COMPACT, int(self._count) // 16):
+                    self.import_stream(self.iter_games())
+            except Exception:
+                logger.exception("Games catalog compaction failed")
+
+    def page(
+        self,
+        page: int,
+        page_size: int,
+        exclude_codes: set[str] | None = None,
+        cancel: threading.Event | None = None,
+        order: str = "rank",
+    ) -> tuple[list[dict], int]:
+        """One page of the catalog in import order, or by playerCount with order="popular"."""
+        if order not in ("rank", "popular"):
+            raise ValueError(f"Unknown catalog order: {order!r}")
+        if cancel is not None and cancel.is_set():
+            raise SearchSuperseded()
         exclude_codes = exclude_codes or set()
         page = max(0, int(page or 0))
         page_size = max(1, int(page_size or 20))
-        total = self.count() - sum(1 for c in exclude_codes if self.get(c) is not None)
-        total = max(0, total)
+        self._ensure_loaded()
+        maps = self._maps
+        if not self._env or maps is None:
+            return [], 0
+
+        gaps = self._rank_gaps(maps, exclude_codes)
+        total = max(0, self.count() - gaps.excluded)
         if total == 0:
             return [], 0
 
@@ -572,121 +1545,399 @@ class GamesService:
         if offset >= total:
             page = max(0, (total - 1) // page_size)
             offset = page * page_size
-
-        if not self._env or not self._order or not self._rank:
-            return [], total
-
-        exclude_ranks: list[int] = []
-        with self._env.ro_transaction() as txn:
-            for c in exclude_codes:
-                rb = self._rank.get(txn, c.encode("utf-8"))
-                r = _u32be_to_int(rb)
-                if r is not None:
-                    exclude_ranks.append(r)
-        exclude_ranks.sort()
-
-        start_rank = offset
-        while True:
-            before = 0
-            for r in exclude_ranks:
-                if r < start_rank:
-                    before += 1
-                else:
-                    break
-            new_rank = offset + before
-            if new_rank == start_rank:
-                break
-            start_rank = new_rank
+        if order == "popular":
+            return self._page_by_popularity(maps, gaps, offset, page_size, exclude_codes), total
+        start_rank = gaps.rank_for_offset(offset)
 
         out: list[dict] = []
         with self._env.ro_transaction() as txn:
-            with Cursor(self._order, txn) as cur:  # type: ignore[arg-type]
+            with Cursor(maps.order, txn) as cur:  # type: ignore[arg-type]
                 k, v = cur.get_full(_u32be(start_rank), MDBXCursorOp.MDBX_SET_RANGE)  # type: ignore[arg-type]
                 while v is not None and len(out) < page_size:
                     code_s = v.decode("utf-8", errors="ignore")
                     if code_s and code_s not in exclude_codes:
-                        game = self._fetch_game_from_mdbx(txn, v)
+                        game = self._fetch_game_from_mdbx(txn, v, maps, extras=False)
                         if game is not None:
                             out.append(game)
                     k, v = cur.get_full(None, MDBXCursorOp.MDBX_NEXT)  # type: ignore[arg-type]
         return out, total
 
-    def search(self, query: str, page: int, page_size: int, exclude_codes: set[str] | None = None) -> tuple[list[dict], int]:
+    def _page_by_popularity(
+        self,
+        maps: _SlotMaps,
+        gaps: _RankGaps,
+        offset: int,
+        page_size: int,
+        exclude_codes: set[str],
+    ) -> list[dict]:
+        assert self._env is not None
+        marks = gaps.pop_marks
+        out: list[dict] = []
+        with self._env.ro_transaction() as txn:
+            with Cursor(maps.pop, txn) as cur:  # type: ignore[arg-type]
+                mark = min(offset // _POP_MARK_EVERY, len(marks) - 1)
+                if mark >= 0:
+                    k, v = cur.get_full(marks[mark], MDBXCursorOp.MDBX_SET_RANGE)  # type: ignore[arg-type]
+                    pos = mark * _POP_MARK_EVERY
+                else:
+                    k, v = cur.get_full(None, MDBXCursorOp.MDBX_FIRST)  # type: ignore[arg-type]
+                    pos = 0
+                while v is not None and len(out) < page_size:
+                    code_s = v.decode("utf-8", errors="ignore")
+                    if code_s and code_s not in exclude_codes:
+                        if pos % _POP_MARK_EVERY == 0:
+                            with self._gaps_lock:
+                                if len(marks) == pos // _POP_MARK_EVERY:
+                                    marks.append(k)
+                        if pos >= offset:
+                            game = self._fetch_game_from_mdbx(txn, v, maps, extras=False)
+                            if game is not None:
+                                out.append(game)
+                        pos += 1
+                    k, v = cur.get_full(None, MDBXCursorOp.MDBX_NEXT)  # type: ignore[arg-type]
+        return out
+
+    def update_players(self, counts: Mapping[str, int]) -> int:
+        """Set playerCount for the given codes in place; returns how many games changed."""
+        with self._writing() as maps:
+            assert self._env is not None
+            changed: dict[str, int] = {}
+            with self._env.rw_transaction() as txn:
+                for code, n in counts.items():
+                    code_b = str(code).encode("utf-8")
+                    rank_b = maps.rank.get(txn, code_b)
+                    raw = maps.games.get(txn, code_b)
+                    game = _decode_game(raw) if raw else None
+                    if rank_b is None or game is None:
+                        continue
+                    n = _player_count(n)
+                    if n == game["playerCount"]:
+                        continue
+                    _delete_entry(maps.pop, txn, _pop_key(game["playerCount"], rank_b))
+                    game["playerCount"] = n
+                    maps.games.put(txn, code_b, _encode_game(game), flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
+                    maps.sig.put(txn, code_b, _encode_signature(game), flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
+                    maps.pop.put(txn, _pop_key(n, rank_b), code_b, flags=MDBXPutFlags.MDBX_UPSERT)  # type: ignore[arg-type]
+                    changed[game["code"]] = n
+                generation = self._next_stored_generation(txn) if changed else self._seen_generation
+                txn.commit()
+
+            self._seen_generation = generation
+
+            if changed:
+                if self._snapshot is not None:
+                    self._snapshot = self._snapshot.with_players(changed)
+                self._bump_generation()
+            return len(changed)
+
+    def _rank_gaps(self, maps: _SlotMaps, exclude_codes: set[str] | None = None) -> _RankGaps:
+        # Cached per exclusion set, so flipping pages with the same selection skips the rank lookups.
+        key = (self._generation, frozenset(exclude_codes or ()))
+        with self._gaps_lock:
+            gaps = self._gaps.get(key)
+            if gaps is not None:
+                self._gaps.move_to_end(key)
+                return gaps
+
+        holes = self._holes
+        ranks: list[int] = []
+        if key[1]:
+            assert self._env is not None
+            with self._env.ro_transaction() as txn:
+                for c in key[1]:
+                    r = _u32be_to_int(maps.rank.get(txn, c.encode("utf-8")))
+                    if r is not None:
+                        ranks.append(r)
+        gaps = _RankGaps(sorted(holes + ranks), excluded=len(ranks))
+
+        with self._gaps_lock:
+            self._gaps[key] = gaps
+            while len(self._gaps) > _MAX_CACHED_GAPS:
+                self._gaps.popitem(last=False)
+        return gaps
+
+    def search(
+        self,
+        query: str,
+        page: int,
+        page_size: int,
+        exclude_codes: set[str] | None = None,
+        cancel: threading.Event | None = None,
+    ) -> tuple[list[dict], int]:
         exclude_codes = exclude_codes or set()
         page = max(0, int(page or 0))
         page_size = max(1, int(page_size or 20))
         variants = _query_variants(query)
         if not variants:
-            return self.page(page, page_size, exclude_codes=exclude_codes)
+            return self.page(page, page_size, exclude_codes=exclude_codes, cancel=cancel)
 
-        tokens: set[str] = set()
-        for v in variants:
-            tokens.update(v.split())
-        index_keys = sorted({t for t in tokens if len(t) >= 3})
+        self._ensure_loaded()
+        maps = self._maps
+        if not self._env or maps is None:
+            return [], 0
 
-        if not self._env or not self._games or not self._order or not self._token:
+        key = tuple(variants)
+        generation = self._generation
+        ranking = self._ranking_cache.get(key, generation)
+        if ranking is None:
+            ranking = self._rank_candidates(maps, variants, cancel)
+            self._ranking_cache.put(key, generation, ranking)
+
+        taken = ranking.take((page + 1) * page_size + len(exclude_codes), cancel)
+        ranked = [c for c in taken if c not in exclude_codes]
+        total = max(len(ranked), ranking.total() - (len(taken) - len(ranked)))
+        if total == 0:
             return [], 0
+        max_page = max(0, (total - 1) // page_size)
+        page = max(0, min(page, max_page))
+        start = page * page_size
 
-        candidates: dict[str, int] = {}
-        max_candidates = 6000
+        out: list[dict] = []
+        with self._env.ro_transaction() as txn:
+            for code_s in ranked[start : start + page_size]:
+                game = self._fetch_game_from_mdbx(txn, code_s.encode("utf-8"), maps, extras=False)
+                if game is not None:
+                    out.append(game)
+        return out, total
 
+    def explain(self, query: str, limit: int = 20) -> dict[str, int]:
+        """Work behind the first `limit` results of a search, ranked afresh without the cache."""
+        variants = _query_variants(query)
+        if not variants:
+            return {"variants": 0, "examined": 0, "fuzzy_scored": 0, "results": 0}
+        ranking = self._rank_candidates(self._require_maps(), variants)
+        results = len(ranking.take(max(0, int(limit))))
+        return {
+            "variants": len(variants),
+            "examined": ranking.examined,
+            "fuzzy_scored": ranking.fuzzy_scored,
+            "results": results,
+        }
+
+    def suggest(
+        self,
+        prefix: str,
+        limit: int = 10,
+        exclude_codes: set[str] | None = None,
+        cancel: threading.Event | None = None,
+    ) -> list[dict]:
+        """Most played games with a name word starting with prefix (in any of its spellings)."""
+        if cancel is not None and cancel.is_set():
+            raise SearchSuperseded()
+        exclude_codes = exclude_codes or set()
+        limit = max(0, int(limit))
+        keys = [v for v in _query_variants(prefix) if len(v) >= 2 and " " not in v]
+        self._ensure_loaded()
+        maps = self._maps
+        if not keys or not limit or not self._env or maps is None:
+            return []
+
+        snap = self._snapshot
+        if snap is not None:
+            rows: set[int] = set()
+            for key in keys:
+                rows.update(snap.rows_with_prefix(key))
+            best = heapq.nsmallest(
+                limit,
+                (i for i in rows if snap.codes[i] not in exclude_codes),
+                key=lambda i: (-snap.players[i], i),
+            )
+            return [dict(GameView(snap, i)) for i in best]
+
+        found: dict[str, tuple[int, int]] = {}
         with self._env.ro_transaction() as txn:
-            if index_keys:
-                with Cursor(self._token, txn) as cur:  # type: ignore[arg-type]
-                    for token in index_keys:
-                        token_b = token.encode("utf-8")
-                        k, v = cur.get_full(token_b, MDBXCursorOp.MDBX_SET_KEY)  # type: ignore[arg-type]
-                        if k is None or v is None:
+            with Cursor(maps.token, txn) as cur:  # type: ignore[arg-type]
+                for key in keys:
+                    for code_s, rank in _read_postings(cur, key, _MAX_POSTINGS).items():
+                        if code_s in found or code_s in exclude_codes:
                             continue
-                        while True:
-                            if len(v) >= 5:
-                                rank = _u32be_to_int(v[:4])
-                                code_b = v[4:]
-                                code_s = code_b.decode("utf-8", errors="ignore")
-                                if code_s and code_s not in exclude_codes and rank is not None:
-                                    prev = candidates.get(code_s)
-                                    if prev is None or rank < prev:
-                                        candidates[code_s] = rank
-                            if len(candidates) >= max_candidates:
-                                break
-                            k2, v2 = cur.get_full(None, MDBXCursorOp.MDBX_NEXT_DUP)  # type: ignore[arg-type]
-                            if k2 is None or v2 is None:
-                                break
-                            k, v = k2, v2
-                        if len(candidates) >= max_candidates:
-                            break
+                        texts = _read_search_texts(txn, maps, code_s.encode("utf-8"))
+                        found[code_s] = (-(texts[0] if texts else 0), rank)
+
+            out: list[dict] = []
+            for code_s in heapq.nsmallest(limit, found, key=found.__getitem__):
+                game = self._fetch_game_from_mdbx(txn, code_s.encode("utf-8"), maps, extras=False)
+                if game is not None:
+                    out.append(game)
+        return out
 
-            if not candidates:
-                take = 2000
-                with Cursor(self._order, txn) as cur:  # type: ignore[arg-type]
-                    k, v = cur.get_full(_u32be(0), MDBXCursorOp.MDBX_SET_RANGE)  # type: ignore[arg-type]
-                    while v is not None and len(candidates) < take:
-                        code_s = v.decode("utf-8", errors="ignore")
-                        if code_s and code_s not in exclude_codes:
-                            rank = _u32be_to_int(k)
-                            if rank is not None:
-                                candidates[code_s] = rank
-                        k, v = cur.get_full(None, MDBXCursorOp.MDBX_NEXT)  # type: ignore[arg-type]
+    def _rank_candidates(
+        self,
+        maps: _SlotMaps,
+        variants: list[str],
+        cancel: threading.Event | None = None,
+    ) -> _LazyRanking:
+        assert self._env is not None
+        variant_keys: list[list[str]] = []
+        for v in variants:
+            tokens = [t for t in dict.fromkeys(v.split()) if len(t) >= 2]
+            longer = [t for t in tokens if len(t) >= _MIN_PREFIX_LEN]
+            variant_keys.append(longer or tokens)
 
-            scored: list[tuple[float, int, dict]] = []
-            for code_s, _rank in candidates.items():
-                game = self._fetch_game_from_mdbx(txn, code_s.encode("utf-8"))
-                if game is None:
+        candidates: dict[str, int] = {}
+        with self._env.ro_transaction() as txn:
+            df: dict[str, int] = {}
+            fixes: dict[str, list[str]] = {}
+            with Cursor(maps.df, txn) as cur, Cursor(maps.gram, txn) as gram_cur:  # type: ignore[arg-type]
+                for keys in variant_keys:
+                    for t in keys:
+                        if t not in df:
+                            df[t] = _prefix_df(cur, t)
+                # No spelling of the query is fully indexed, so its unknown tokens are likely typos:
+                # stand in the indexed words a couple of edits away.
+                if not any(keys and all(df[t] for t in keys) for keys in variant_keys):
+                    for t in [t for t in df if not df[t] and len(t) >= _MIN_TYPO_LEN]:
+                        fixes[t] = _typo_fixes(gram_cur, t)
+                        for w in fixes[t]:
+                            if w not in df:
+                                df[w] = _prefix_df(cur, w)
+
+            with Cursor(maps.token, txn) as cur:  # type: ignore[arg-type]
+                postings: dict[str, dict[str, int]] = {}
+
+                def read(token: str) -> dict[str, int]:
+                    if token not in postings:
+                        postings[token] = _read_postings(cur, token, _MAX_POSTINGS)
+                    return postings[token]
+
+                def read_any(words: list[str]) -> dict[str, int]:
+                    if len(words) == 1:
+                        return read(words[0])
+                    found: dict[str, int] = {}
+                    for w in words:
+                        for c, r in read(w).items():
+                            if r < found.get(c, r + 1):
+                                found[c] = r
+                    return found
+
+                # Games containing every token of a variant (or one of its typo fixes), rarest posting list first.
+                for keys in variant_keys:
+                    groups = []
+                    for t in keys:
+                        words = [t] if df[t] else fixes.get(t, [])
+                        if words:
+                            groups.append((sum(df[w] for w in words), words))
+                    if not groups:
+                        continue
+                    groups.sort(key=lambda g: g[0])
+                    hits = dict(read_any(groups[0][1]))
+                    for n, words in groups[1:]:
+                        if not hits:
+                            break
+                        if n > _MAX_POSTINGS:
+                            continue
+                        other = read_any(words)
+                        hits = {c: r for c, r in hits.items() if c in other}
+                    for c, r in hits.items():
+                        candidates.setdefault(c, r)
+
+                # Few full matches: widen to games sharing any token so partial and fuzzy matches can rank too.
+                if len(candidates) < _MIN_INTERSECTION_HITS:
+                    for t in sorted((t for t in df if df[t]), key=df.__getitem__):
+                        for c, r in read(t).items():
+                            candidates.setdefault(c, r)
+                        if len(candidates) >= _MAX_POSTINGS:
+                            break
+
+            pending: list[tuple[float, int, int, str]] = []
+            scored: list[tuple[float, int, int, str]] = []
+            query_lengths = {len(q) for q in variants}
+            for seq, code_s in enumerate(sorted(candidates, key=candidates.__getitem__)):
+                if cancel is not None and seq % 256 == 0 and cancel.is_set():
+                    raise SearchSuperseded()
+                texts = _read_search_texts(txn, maps, code_s.encode("utf-8"))
+                if texts is None:
                     continue
-                score = _game_match_score(game, variants)
-                if score < 0.55:
+                pop, hay, hay_lat, targets = texts
+                coverage = _coverage_score(hay, hay_lat, variants)
+                if coverage >= 1.0:
+                    scored.append((-1.0, -pop, seq, code_s))
                     continue
-                pop = int(game.get("playerCount") or 0)
-                scored.append((score, pop, game))
-
-        scored.sort(key=lambda x: (x[0], x[1]), reverse=True)
-        total = len(scored)
-        if total == 0:
-            return [], 0
-        max_page = max(0, (total - 1) // page_size)
-        page = max(0, min(page, max_page))
-        start = page * page_size
-        return [g for _, _, g in scored[start : start + page_size]], total
+                bound = max(coverage, _fuzzy_upper_bound(targets, query_lengths))
+                if bound >= _MATCH_CUTOFF:
+                    pending.append((-bound, -pop, seq, code_s))
 
+        matchers = [self._similarity(q, _MATCH_CUTOFF) for q in variants]
+        return _LazyRanking(self._env, maps, variants, matchers, pending, scored, examined=len(candidates))
 
-games_service = GamesService()
+    async def watch(self) -> None:
+        """Poll for other processes' writes until cancelled; get() and labels() do not check on their own."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(max(self._refresh_interval, 0.5))
+            try:
+                await loop.run_in_executor(self._get_executor(), self.refresh)
+            except Exception:
+                logger.exception("Games catalog refresh failed")
+
+    async def asearch(
+        self,
+        query: str,
+        page: int,
+        page_size: int,
+        exclude_codes: set[str] | None = None,
+        owner: Hashable | None = None,
+    ) -> tuple[list[dict], int]:
+        return await self._run_query(owner, self.search, query, page, page_size, exclude_codes=exclude_codes)
+
+    async def apage(
+        self,
+        page: int,
+        page_size: int,
+        exclude_codes: set[str] | None = None,
+        owner: Hashable | None = None,
+        order: str = "rank",
+    ) -> tuple[list[dict], int]:
+        return await self._run_query(owner, self.page, page, page_size, exclude_codes=exclude_codes, order=order)
+
+    async def asuggest(
+        self,
+        prefix: str,
+        limit: int = 10,
+        exclude_codes: set[str] | None = None,
+        owner: Hashable | None = None,
+    ) -> list[dict]:
+        return await self._run_query(owner, self.suggest, prefix, limit, exclude_codes=exclude_codes)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Called from the event loop and from writer threads (remove() queues compaction), so create it once.
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="games")
+            return self._executor
+
+    def _refreshed(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        # Runs on the executor, so a reload after another process's write never blocks the event loop.
+        self.refresh()
+        return fn(*args, **kwargs)
+
+    async def _run_query(self, owner: Hashable | None, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        cancel = threading.Event()
+        if owner is not None:
+            prev = self._inflight.get(owner)
+            if prev is not None:
+                prev.set()
+            self._inflight[owner] = cancel
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._get_executor(),
+                functools.partial(self._refreshed, fn, *args, cancel=cancel, **kwargs),
+            )
+        finally:
+            if owner is not None and self._inflight.get(owner) is cancel:
+                del self._inflight[owner]
+        if cancel.is_set():
+            raise SearchSuperseded()
+        return result
+
+
+games_service = GamesService(
+    similarity=settings.games_similarity,
+    workers=settings.games_search_workers,
+    cache_size=settings.games_search_cache_size,
+    snapshot=settings.games_snapshot,
+    readonly=settings.games_readonly,
+    refresh_interval=settings.games_refresh_interval_sec,
+)
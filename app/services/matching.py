@@ -1,22 +1,212 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Callable
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models.search import SearchRequest
+from app.models.user import User
 from app.repositories.block_repo import BlockRepository
 from app.repositories.offer_repo import OfferRepository
 from app.repositories.search_repo import SearchRepository
 from app.repositories.user_repo import UserRepository
+from app.services.cooldowns import make_pair_cooldowns
+from app.services.pairing import max_weight_matching
+
+_AGE_BUCKET_YEARS = 2
+_ANY_MODE = "*"
+_POOL_RESYNC_SEC = 300
+_CANDIDATE_BATCH = 200
+_PLAN_COHORT = 150
+
+
+class PoolEntry:
+    """A waiting request together with the profile of the user behind it."""
+
+    __slots__ = (
+        "request_id",
+        "user_id",
+        "language",
+        "min_age",
+        "max_age",
+        "modes",
+        "user_language",
+        "user_age",
+        "user_modes",
+    )
+
+    def __init__(self, req: SearchRequest, user: User):
+        self.request_id: int = req.id
+        self.user_id: int = req.user_id
+        self.language = req.language
+        self.min_age = req.min_age
+        self.max_age = req.max_age
+        self.modes = frozenset(req.modes or ())
+        self.user_language = user.language
+        self.user_age = user.age
+        self.user_modes = frozenset(user.modes or ())
+
+    def accepts(self, language: str, age: int, modes: frozenset[str]) -> bool:
+        """Whether this request takes a partner with the given profile."""
+        if self.language and language != self.language:
+            return False
+        if not (self.min_age <= age <= self.max_age):
+            return False
+        return not self.modes or bool(self.modes & modes)
+
+    def cells(self) -> list[tuple[str, int, str]]:
+        bucket = self.user_age // _AGE_BUCKET_YEARS
+        return [(self.user_language, bucket, mode) for mode in (_ANY_MODE, *self.user_modes)]
+
+
+def pair_weight(a: PoolEntry, b: PoolEntry, waited_sec: float) -> int:
+    """Batch matching score of a compatible pair: time both have waited, shared modes, close ages."""
+    waited = min(int(waited_sec) // 60, 60)
+    shared = min(len(a.modes & b.user_modes) + len(b.modes & a.user_modes), 4)
+    age_gap = min(abs(a.user_age - b.user_age), 10)
+    return 20 + waited + 5 * shared - age_gap
+
+
+class MatchPool:
+    """Waiting requests indexed by who is waiting: (language, age bucket, mode) of their profile.
+
+    The database stays authoritative. The pool only narrows down whom to check; it is replayed
+    from the waiting rows on first use and every _POOL_RESYNC_SEC to forget changes made elsewhere.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, PoolEntry] = {}
+        self._by_user: dict[int, int] = {}
+        self._cells: dict[tuple[str, int, str], dict[int, PoolEntry]] = {}
+        self._languages: Counter[str] = Counter()
+        self.last_id = 0
+        self.synced_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, request_id: int) -> PoolEntry | None:
+        return self._entries.get(request_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_user.clear()
+        self._cells.clear()
+        self._languages.clear()
+        self.last_id = 0
+
+    def add(self, entry: PoolEntry) -> None:
+        self.discard(entry.request_id)
+        self.discard_user(entry.user_id)
+        self._entries[entry.request_id] = entry
+        self._by_user[entry.user_id] = entry.request_id
+        for cell in entry.cells():
+            self._cells.setdefault(cell, {})[entry.request_id] = entry
+        self._languages[entry.user_language] += 1
+        self.last_id = max(self.last_id, entry.request_id)
+
+    def discard(self, request_id: int) -> None:
+        entry = self._entries.pop(request_id, None)
+        if entry is None:
+            return
+        if self._by_user.get(entry.user_id) == request_id:
+            del self._by_user[entry.user_id]
+        for cell in entry.cells():
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.pop(request_id, None)
+                if not bucket:
+                    del self._cells[cell]
+        self._languages[entry.user_language] -= 1
+        if self._languages[entry.user_language] <= 0:
+            del self._languages[entry.user_language]
+
+    def discard_user(self, user_id: int) -> None:
+        request_id = self._by_user.get(user_id)
+        if request_id is not None:
+            self.discard(request_id)
+
+    def candidates(self, entry: PoolEntry) -> list[PoolEntry]:
+        """Pooled requests compatible with entry both ways, oldest first; only matching cells are visited."""
+        languages = [entry.language] if entry.language else list(self._languages)
+        modes = entry.modes or (_ANY_MODE,)
+        found: dict[int, PoolEntry] = {}
+        for language in languages:
+            for bucket in range(entry.min_age // _AGE_BUCKET_YEARS, entry.max_age // _AGE_BUCKET_YEARS + 1):
+                for mode in modes:
+                    cell = self._cells.get((language, bucket, mode))
+                    if cell:
+                        found.update(cell)
+        return sorted(
+            (
+                other
+                for other in found.values()
+                if other.user_id != entry.user_id
+                and entry.min_age <= other.user_age <= entry.max_age
+                and other.accepts(entry.user_language, entry.user_age, entry.user_modes)
+            ),
+            key=lambda other: other.request_id,
+        )
+
+    def plan(
+        self,
+        waited: dict[int, float],
+        allowed: Callable[[PoolEntry, PoolEntry], bool] | None = None,
+    ) -> list[tuple[PoolEntry, PoolEntry]]:
+        """Pair as many pooled requests as possible, maximizing the total pair_weight.
+
+        waited holds seconds waited per request id; only those requests take part. The blossom step
+        is cubic, so the pool is matched in cohorts of at most _PLAN_COHORT neighbours by language
+        and age; whoever a cohort leaves unmatched gets a second chance in the next one.
+        """
+        order = sorted(
+            (entry for entry in map(self._entries.get, waited) if entry is not None),
+            key=lambda entry: (entry.user_language, entry.user_age, entry.request_id),
+        )
+        pairs: list[tuple[PoolEntry, PoolEntry]] = []
+        carried: list[PoolEntry] = []
+        for start in range(0, len(order), _PLAN_COHORT):
+            fresh = order[start : start + _PLAN_COHORT]
+            matched = self._plan_cohort(carried + fresh, waited, allowed)
+            pairs.extend(matched)
+            paired = {entry.request_id for pair in matched for entry in pair}
+            carried = [entry for entry in fresh if entry.request_id not in paired]
+        return sorted(pairs, key=lambda pair: min(pair[0].request_id, pair[1].request_id))
+
+    @staticmethod
+    def _plan_cohort(
+        cohort: list[PoolEntry],
+        waited: dict[int, float],
+        allowed: Callable[[PoolEntry, PoolEntry], bool] | None,
+    ) -> list[tuple[PoolEntry, PoolEntry]]:
+        # Same test as candidates(), but only within the cohort.
+        edges: list[tuple[int, int, int]] = []
+        for i, me in enumerate(cohort):
+            for j in range(i + 1, len(cohort)):
+                other = cohort[j]
+                if other.user_id == me.user_id:
+                    continue
+                if not me.accepts(other.user_language, other.user_age, other.user_modes):
+                    continue
+                if not other.accepts(me.user_language, me.user_age, me.user_modes):
+                    continue
+                if allowed is not None and not allowed(me, other):
+                    continue
+                weight = pair_weight(me, other, waited[me.request_id] + waited[other.request_id])
+                edges.append((i, j, weight))
+        return [(cohort[i], cohort[j]) for i, j in max_weight_matching(edges, max_cardinality=True)]
 
 
 class MatchingService:
     def __init__(self) -> None:
-        self._lock = asyncio.Lock()
-        self._recent_pairs: dict[tuple[int, int], float] = {}
-        self.recent_ttl_sec = 1800
+        self._locks: defaultdict[tuple[str, int], asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._pool = MatchPool()
+        self.cooldowns = make_pair_cooldowns(settings.pair_cooldown_store, settings.pair_cooldown_sec)
 
     async def enqueue(
         self,
@@ -44,8 +234,13 @@ class MatchingService:
         }
         user.state = "searching"
         await session.flush()
+        if not settings.match_on_enqueue:
+            # Left to the batch matcher.
+            return req, None
 
-        async with self._lock:
+        async with self._shard_lock(language or user.language, user.age):
+            self._pool.discard_user(user_id)
+            await self._sync_pool(session)
             offer_id = await self._try_match(session, req)
         return req, offer_id
 
@@ -53,70 +248,120 @@ class MatchingService:
         user_repo = UserRepository(session)
         search_repo = SearchRepository(session)
         await search_repo.cancel_for_user(user_id)
+        self._pool.discard_user(user_id)
         user = await user_repo.get(user_id)
         if user and user.state == "searching":
             user.state = "idle"
         await session.flush()
 
+    def _shard_lock(self, language: str, age: int) -> asyncio.Lock:
+        # Enqueues of one cohort queue up here instead of racing for the same candidates; races between
+        # cohorts (or processes) are settled by the row claim in _try_match.
+        return self._locks[(language, age // _AGE_BUCKET_YEARS)]
+
+    async def _sync_pool(self, session: AsyncSession) -> None:
+        # Pull in requests created since the last sync (including by other processes); now and then start over.
+        now = time.monotonic()
+        if self._pool.synced_at is None or now - self._pool.synced_at > _POOL_RESYNC_SEC:
+            self._pool.clear()
+            self._pool.synced_at = now
+        for req, user in await SearchRepository(session).list_waiting_with_users(self._pool.last_id):
+            self._pool.add(PoolEntry(req, user))
+
     async def _try_match(self, session: AsyncSession, req: SearchRequest) -> int | None:
         user_repo = UserRepository(session)
-        block_repo = BlockRepository(session)
         search_repo = SearchRepository(session)
-        offer_repo = OfferRepository(session)
 
         my_user = await user_repo.get(req.user_id)
         if not my_user:
             return None
 
-        stmt = select(SearchRequest).where(SearchRequest.status == "waiting").order_by(SearchRequest.created_at.asc())
-        waiting = list((await session.scalars(stmt)).all())
-
-        for other_req in waiting:
-            if other_req.user_id == req.user_id:
-                continue
-            if self._is_recent_pair(req.user_id, other_req.user_id):
-                continue
-
-            other_user = await user_repo.get(other_req.user_id)
-            if not other_user or other_user.is_banned:
-                continue
+        me = PoolEntry(req, my_user)
+        self._pool.add(me)
+        cooling = await self.cooldowns.partners(session, req.user_id)
+        request_ids = [
+            candidate.request_id for candidate in self._pool.candidates(me) if candidate.user_id not in cooling
+        ]
+        # The pool may be stale, so candidates are re-read (status, bans, blocks, profiles) a batch at a time.
+        for start in range(0, len(request_ids), _CANDIDATE_BATCH):
+            batch = request_ids[start : start + _CANDIDATE_BATCH]
+            for other_req, other_user in await search_repo.list_candidates(req, my_user, batch):
+                if not self._compatible(my_user, req, other_user, other_req):
+                    # The profile changed after it was pooled; re-index it under its current cells.
+                    self._pool.add(PoolEntry(other_req, other_user))
+                    continue
+                claimed = await search_repo.claim([req.id, other_req.id])
+                if claimed.get(req.id) != "waiting":
+                    return None
+                if claimed.get(other_req.id) == "waiting":
+                    return await self._create_offer(session, req, my_user, other_req, other_user)
+                if other_req.id in claimed:
+                    self._pool.discard(other_req.id)
+                # Otherwise another transaction is pairing it right now.
+        return None
 
-            if await block_repo.is_blocked_pair(req.user_id, other_req.user_id):
-                continue
+    async def _create_offer(
+        self,
+        session: AsyncSession,
+        req: SearchRequest,
+        my_user: User,
+        other_req: SearchRequest,
+        other_user: User,
+    ) -> int:
+        offer = await OfferRepository(session).create(req.user_id, other_req.user_id, req.id, other_req.id)
 
-            if not self._compatible(my_user, req, other_user, other_req):
-                continue
+        req.status = "matched"
+        other_req.status = "matched"
 
-            offer = await offer_repo.create(
-                req.user_id, other_req.user_id, req.id, other_req.id
-            )
+        my_user.state = "matching"
+        other_user.state = "matching"
+        my_user.active_offer_id = offer.id
+        other_user.active_offer_id = offer.id
 
-            req.status = "matched"
-            other_req.status = "matched"
+        await session.flush()
+        self._pool.discard(req.id)
+        self._pool.discard(other_req.id)
+        return offer.id
 
-            my_user.state = "matching"
-            other_user.state = "matching"
-            my_user.active_offer_id = offer.id
-            other_user.active_offer_id = offer.id
+    async def match_waiting(self, session: AsyncSession) -> list[int]:
+        """Pair up everyone currently waiting in one go (see MatchPool.plan); returns the new offer ids."""
+        search_repo = SearchRepository(session)
+        rows: dict[int, tuple[SearchRequest, User]] = {}
+        waited: dict[int, float] = {}
+        now = datetime.now(timezone.utc)
+        self._pool.clear()
+        self._pool.synced_at = time.monotonic()
+        for req, user in await search_repo.list_waiting_with_users():
+            self._pool.add(PoolEntry(req, user))
+            if user.is_banned:
+                continue
+            created_at = req.created_at if req.created_at.tzinfo else req.created_at.replace(tzinfo=timezone.utc)
+            rows[req.id] = (req, user)
+            waited[req.id] = max(0.0, (now - created_at).total_seconds())
+        if len(waited) < 2:
+            return []
 
-            await session.flush()
-            return offer.id
+        user_ids = [user.id for _, user in rows.values()]
+        excluded = await BlockRepository(session).list_pairs_among(user_ids)
+        excluded |= await self.cooldowns.pairs_among(session, user_ids)
 
-        return None
+        def allowed(a: PoolEntry, b: PoolEntry) -> bool:
+            return (min(a.user_id, b.user_id), max(a.user_id, b.user_id)) not in excluded
 
-    def mark_recent_pair(self, user_a: int, user_b: int) -> None:
-        key = tuple(sorted((user_a, user_b)))
-        self._recent_pairs[key] = asyncio.get_running_loop().time()
+        # Planning a large pool takes a while; it only reads PoolEntry snapshots, so it runs off the loop.
+        plan = await asyncio.to_thread(self._pool.plan, waited, allowed)
+        offer_ids: list[int] = []
+        for a, b in plan:
+            claimed = await search_repo.claim([a.request_id, b.request_id])
+            if claimed.get(a.request_id) != "waiting" or claimed.get(b.request_id) != "waiting":
+                continue
+            req, my_user = rows[a.request_id]
+            other_req, other_user = rows[b.request_id]
+            offer_ids.append(await self._create_offer(session, req, my_user, other_req, other_user))
+        return offer_ids
 
-    def _is_recent_pair(self, user_a: int, user_b: int) -> bool:
-        key = tuple(sorted((user_a, user_b)))
-        ts = self._recent_pairs.get(key)
-        if ts is None:
-            return False
-        if asyncio.get_running_loop().time() - ts > self.recent_ttl_sec:
-            self._recent_pairs.pop(key, None)
-            return False
-        return True
+    async def mark_recent_pair(self, session: AsyncSession, user_a: int, user_b: int) -> None:
+        await self.cooldowns.add(session, user_a, user_b)
 
     @staticmethod
     def _compatible(my_user, req, other_user, other_req) -> bool:
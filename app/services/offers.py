@@ -46,12 +46,9 @@ class OfferService:
             return
 
         offer.status = "declined"
-        try:
-            from app.services.matching import matching_service
+        from app.services.matching import matching_service
 
-            matching_service.mark_recent_pair(offer.user1_id, offer.user2_id)
-        except Exception:
-            pass
+        await matching_service.mark_recent_pair(session, offer.user1_id, offer.user2_id)
 
         for uid in (offer.user1_id, offer.user2_id):
             user = await user_repo.get(uid)
@@ -80,12 +77,9 @@ class OfferService:
         await block_repo.add(blocker_id, target_id)
 
         offer.status = "blocked"
-        try:
-            from app.services.matching import matching_service
+        from app.services.matching import matching_service
 
-            matching_service.mark_recent_pair(offer.user1_id, offer.user2_id)
-        except Exception:
-            pass
+        await matching_service.mark_recent_pair(session, offer.user1_id, offer.user2_id)
 
         for uid in (offer.user1_id, offer.user2_id):
             user = await user_repo.get(uid)
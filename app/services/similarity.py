@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from difflib import SequenceMatcher
+from typing import Callable
+
+# A matcher is compiled once per query variant and then called for every target string.
+# It returns a similarity in 0..1; values below the cutoff it was compiled with may be
+# reported as 0.0, because callers only compare the result against that cutoff.
+Matcher = Callable[[str], float]
+
+
+def length_bound(m: int, n: int) -> float:
+    """Upper bound of every engine's similarity for strings of lengths m and n."""
+    if not m or not n:
+        return 0.0
+    return 2.0 * min(m, n) / (m + n)
+
+
+def _char_masks(query: str) -> dict[str, int]:
+    masks: dict[str, int] = {}
+    for i, ch in enumerate(query):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    return masks
+
+
+def difflib_matcher(query: str, cutoff: float = 0.0) -> Matcher:
+    def score(target: str) -> float:
+        sm = SequenceMatcher(None, query, target)
+        if sm.real_quick_ratio() < cutoff or sm.quick_ratio() < cutoff:
+            return 0.0
+        return sm.ratio()
+
+    return score
+
+
+def lcs_matcher(query: str, cutoff: float = 0.0) -> Matcher:
+    """Indel similarity 2*LCS/(m+n), the same formula SequenceMatcher.ratio() approximates.
+
+    The LCS length is computed with the Allison-Dix/Hyyro bit-vector recurrence, one
+    big-int step per target character.
+    """
+    m = len(query)
+    masks = _char_masks(query)
+    full = (1 << m) - 1
+
+    def score(target: str) -> float:
+        n = len(target)
+        if length_bound(m, n) < cutoff or not m:
+            return 0.0
+        v = full
+        for ch in target:
+            u = v & masks.get(ch, 0)
+            v = ((v + u) | (v - u)) & full
+        lcs = m - v.bit_count()
+        return 2.0 * lcs / (m + n)
+
+    return score
+
+
+def levenshtein_matcher(query: str, cutoff: float = 0.0) -> Matcher:
+    """Normalized edit similarity 1 - d/max(m, n) using Myers' bit-parallel algorithm.
+
+    The distance computation stops as soon as it can no longer reach the cutoff.
+    """
+    m = len(query)
+    masks = _char_masks(query)
+    full = (1 << m) - 1
+    last = 1 << (m - 1) if m else 0
+
+    def score(target: str) -> float:
+        n = len(target)
+        if not m or not n:
+            return 0.0
+        longest = max(m, n)
+        max_dist = int((1.0 - cutoff) * longest + 1e-9)
+        if abs(m - n) > max_dist:
+            return 0.0
+
+        pv = full
+        mv = 0
+        dist = m
+        for j, ch in enumerate(target, 1):
+            eq = masks.get(ch, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = (mv | ~(xh | pv)) & full
+            mh = pv & xh
+            if ph & last:
+                dist += 1
+            elif mh & last:
+                dist -= 1
+            if dist - (n - j) > max_dist:
+                return 0.0
+            ph = ((ph << 1) | 1) & full
+            mh = (mh << 1) & full
+            pv = (mh | ~(xv | ph)) & full
+            mv = ph & xv
+        return 1.0 - dist / longest
+
+    return score
+
+
+SIMILARITY_ENGINES: dict[str, Callable[[str, float], Matcher]] = {
+    "difflib": difflib_matcher,
+    "lcs": lcs_matcher,
+    "levenshtein": levenshtein_matcher,
+}
+
+
+def get_similarity_engine(name: str | None) -> Callable[[str, float], Matcher]:
+    key = (name or "").strip().lower()
+    try:
+        return SIMILARITY_ENGINES[key]
+    except KeyError:
+        raise ValueError(f"Unknown similarity engine: {name!r}") from None
@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+# The benchmark never talks to Telegram, but importing app.services loads the settings, which require a token.
+os.environ.setdefault("BOT_TOKEN", "bench")
+
+from app.services.games import GamesService  # noqa: E402
+
+# English word -> Russian name word; most synthetic names mix these with a made-up brand.
+WORDS = {
+    "tycoon": "тайкун",
+    "simulator": "симулятор",
+    "obby": "обби",
+    "escape": "побег",
+    "tower": "башня",
+    "world": "мир",
+    "mansion": "особняк",
+    "brainrot": "брейнрот",
+    "prison": "тюрьма",
+    "pet": "питомец",
+    "battle": "битва",
+    "race": "гонка",
+    "horror": "хоррор",
+    "story": "история",
+    "city": "город",
+    "island": "остров",
+    "zombie": "зомби",
+    "ninja": "ниндзя",
+    "fishing": "рыбалка",
+    "mining": "шахта",
+    "farm": "ферма",
+    "car": "машина",
+    "school": "школа",
+    "hospital": "больница",
+    "pizza": "пицца",
+    "parkour": "паркур",
+    "survival": "выживание",
+    "arena": "арена",
+    "legends": "легенды",
+    "kingdom": "королевство",
+    "dragon": "дракон",
+    "pirate": "пират",
+    "space": "космос",
+    "robot": "робот",
+    "army": "армия",
+    "war": "война",
+    "hide": "прятки",
+    "seek": "поиск",
+    "clicker": "кликер",
+    "defense": "оборона",
+    "rivals": "соперники",
+    "doors": "двери",
+    "fruits": "фрукты",
+    "speed": "скорость",
+    "lumber": "лесоруб",
+    "restaurant": "ресторан",
+    "bank": "банк",
+    "heist": "ограбление",
+    "cafe": "кафе",
+    "mall": "торговый центр",
+}
+
+# Latin syllable -> Cyrillic spelling; brands are 2-3 syllables so most of them are unique.
+SYLLABLES = [
+    ("ka", "ка"), ("zor", "зор"), ("vak", "вак"), ("bli", "бли"), ("mo", "мо"), ("rin", "рин"),
+    ("ta", "та"), ("lux", "люкс"), ("po", "по"), ("gar", "гар"), ("ne", "не"), ("dro", "дро"),
+    ("fi", "фи"), ("sul", "сул"), ("ven", "вен"), ("qua", "ква"), ("ri", "ри"), ("tok", "ток"),
+    ("mi", "ми"), ("bor", "бор"), ("ze", "зе"), ("lan", "лан"), ("pu", "пу"), ("dex", "декс"),
+]
+
+_EN_KEYS = "qwertyuiop[]asdfghjkl;'zxcvbnm,."
+_RU_KEYS = "йцукенгшщзхъфывапролджэячсмитьбю"
+_WRONG_LAYOUT = str.maketrans(_EN_KEYS, _RU_KEYS)
+
+
+def _brand(rnd: random.Random) -> tuple[str, str]:
+    parts = [rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 3))]
+    lat = "".join(p[0] for p in parts)
+    cyr = "".join(p[1] for p in parts)
+    return lat.title(), cyr.title()
+
+
+def build_catalog(size: int, seed: int = 1) -> list[dict]:
+    """Synthetic catalog with Roblox-like RU/EN names and a long-tailed playerCount."""
+    rnd = random.Random(seed)
+    words = list(WORDS)
+    brands = [_brand(rnd) for _ in range(max(1, size // 3))]
+    games: list[dict] = []
+    for i in range(size):
+        picked = rnd.sample(words, rnd.randint(1, 3))
+        en = [w.title() for w in picked]
+        ru = [WORDS[w].title() for w in picked]
+        if rnd.random() < 0.7:
+            lat, cyr = rnd.choice(brands)
+            en.insert(0, lat)
+            ru.insert(0, cyr)
+        if rnd.random() < 0.1:
+            n = str(rnd.randint(2, 99))
+            en.append(n)
+            ru.append(n)
+        name_en = " ".join(en)
+        # Many real games keep their English title in the Russian locale.
+        name_ru = name_en if rnd.random() < 0.3 else " ".join(ru)
+        games.append(
+            {
+                "code": str(1_000_000 + i),
+                "name_ru": name_ru,
+                "name_en": name_en,
+                "playerCount": int(rnd.paretovariate(1.2) * 10) - 10,
+            }
+        )
+    return games
+
+
+def _typo(word: str, rnd: random.Random) -> str:
+    i = rnd.randrange(1, len(word) - 1)
+    kind = rnd.choice(("delete", "swap", "replace", "insert"))
+    if kind == "delete":
+        return word[:i] + word[i + 1 :]
+    if kind == "swap":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2 :]
+    letter = rnd.choice("abcdefghijklmnopqrstuvwxyz")
+    if kind == "replace":
+        return word[:i] + letter + word[i + 1 :]
+    return word[:i] + letter + word[i:]
+
+
+def build_queries(games: list[dict], count: int, seed: int = 1) -> list[dict]:
+    """Labeled queries: each one names a target game and lists every game it should count as a hit for."""
+    rnd = random.Random(seed)
+    by_name: dict[str, list[str]] = {}
+    by_word: dict[str, list[str]] = {}
+    for g in games:
+        by_name.setdefault(g["name_en"].casefold(), []).append(g["code"])
+        for w in set(g["name_en"].casefold().split()):
+            by_word.setdefault(w, []).append(g["code"])
+
+    kinds = ("en", "ru", "layout", "typo", "partial", "prefix")
+    queries: list[dict] = []
+    for n in range(count):
+        g = rnd.choice(games)
+        kind = kinds[n % len(kinds)]
+        name = g["name_en"].casefold()
+        expected = by_name[name]
+        longest = max(name.split(), key=len)
+        if kind == "en":
+            text = name
+        elif kind == "ru":
+            text = g["name_ru"].casefold()
+        elif kind == "layout":
+            text = name.translate(_WRONG_LAYOUT)
+        elif kind == "typo":
+            words = name.split()
+            i = words.index(longest)
+            if len(longest) >= 5:
+                words[i] = _typo(longest, rnd)
+            text = " ".join(words)
+        elif kind == "partial":
+            text = longest
+            expected = by_word[longest]
+        else:
+            text = longest[:4]
+            expected = [c for w, codes in by_word.items() if w.startswith(text) for c in codes]
+        queries.append({"kind": kind, "query": text, "target": g["code"], "expected": sorted(set(expected))})
+    return queries
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def latency_row(times: list[float]) -> dict[str, float]:
+    return {
+        "n": len(times),
+        "p50_ms": percentile(times, 50) * 1000,
+        "p95_ms": percentile(times, 95) * 1000,
+        "p99_ms": percentile(times, 99) * 1000,
+    }
+
+
+def quality_row(ranked: list[list[str]], queries: list[dict], k: int = 20) -> dict[str, float]:
+    hits = 0
+    rr = 0.0
+    for codes, q in zip(ranked, queries):
+        expected = set(q["expected"])
+        for pos, code in enumerate(codes[:k], start=1):
+            if code in expected:
+                hits += 1
+                rr += 1 / pos
+                break
+    n = max(1, len(queries))
+    return {f"recall@{k}": hits / n, "mrr": rr / n}
+
+
+def _timed(fn: Callable[[], object]) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def run_size(size: int, queries: list[dict] | None, args: argparse.Namespace, workdir: Path) -> dict:
+    games = build_catalog(size, seed=args.seed)
+    if queries is None:
+        queries = build_queries(games, args.queries, seed=args.seed)
+    path = workdir / f"games-{size}.mdbx"
+    # No ranking cache: every search is measured cold, as a first-time query would be.
+    svc = GamesService(str(path), similarity=args.similarity, cache_size=0, snapshot=not args.no_snapshot)
+    build_seconds, _ = _timed(lambda: svc.import_stream(games))
+    warmup = svc.warmup()
+
+    report: dict = {
+        "size": size,
+        "build_s": build_seconds,
+        "file_mb": path.stat().st_size / 1e6,
+        "warmup_s": sum(warmup.values()),
+        "ops": {},
+        "kinds": {},
+    }
+
+    rnd = random.Random(args.seed)
+    search_times: list[float] = []
+    by_kind: dict[str, tuple[list[float], list[list[str]], list[dict], list[dict]]] = {}
+    for q in queries:
+        if q["kind"] == "prefix":
+            seconds, found = _timed(lambda: svc.suggest(q["query"], 21))
+            codes = [g["code"] for g in found]  # type: ignore[union-attr]
+            work = {"examined": len(codes), "fuzzy_scored": 0}
+        else:
+            seconds, (found, _) = _timed(lambda: svc.search(q["query"], 0, 20))  # type: ignore[misc]
+            codes = [g["code"] for g in found]
+            work = svc.explain(q["query"], 20)
+            search_times.append(seconds)
+        times, ranked, labeled, works = by_kind.setdefault(q["kind"], ([], [], [], []))
+        times.append(seconds)
+        ranked.append(codes)
+        labeled.append(q)
+        works.append(work)
+
+    page_times: list[float] = []
+    label_times: list[float] = []
+    codes = [g["code"] for g in games]
+    for _ in range(max(1, args.queries // 2)):
+        selected = set(rnd.sample(codes, min(3, len(codes))))
+        page = rnd.randrange(max(1, min(50, size // 20)))
+        seconds, (items, _) = _timed(lambda: svc.page(page, 20, exclude_codes=selected, order="popular"))  # type: ignore[misc]
+        page_times.append(seconds)
+        shown = [g["code"] for g in items]
+        label_times.append(_timed(lambda: svc.labels(shown, "ru"))[0])
+
+    report["ops"]["search"] = latency_row(search_times)
+    report["ops"]["suggest"] = latency_row(by_kind.get("prefix", ([], [], [], []))[0])
+    report["ops"]["page_popular"] = latency_row(page_times)
+    report["ops"]["labels"] = latency_row(label_times)
+    for kind, (times, ranked, labeled, works) in by_kind.items():
+        row = latency_row(times)
+        row.update(quality_row(ranked, labeled))
+        row["examined_avg"] = statistics.fmean(w["examined"] for w in works)
+        row["fuzzy_scored_avg"] = statistics.fmean(w["fuzzy_scored"] for w in works)
+        report["kinds"][kind] = row
+    svc._close_mdbx()
+    return report
+
+
+def _print_report(report: dict) -> None:
+    print(
+        f"\n== {report['size']} games: build {report['build_s']:.1f}s, file {report['file_mb']:.1f} MB, "
+        f"warmup {report['warmup_s']:.2f}s"
+    )
+    print(f"{'op':<14}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for op, row in report["ops"].items():
+        print(f"{op:<14}{row['n']:>6}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}")
+    print(f"{'kind':<14}{'n':>6}{'p50 ms':>10}{'p99 ms':>10}{'recall@20':>11}{'mrr':>7}{'examined':>10}{'fuzzy':>8}")
+    for kind, row in report["kinds"].items():
+        print(
+            f"{kind:<14}{row['n']:>6}{row['p50_ms']:>10.2f}{row['p99_ms']:>10.2f}{row['recall@20']:>11.3f}"
+            f"{row['mrr']:>7.3f}{row['examined_avg']:>10.0f}{row['fuzzy_scored_avg']:>8.0f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark games search on synthetic catalogs (offline).")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated catalog sizes")
+    parser.add_argument("--queries", type=int, default=300, help="Generated queries per catalog size")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--similarity", default="lcs", help="lcs | levenshtein | difflib")
+    parser.add_argument("--no-snapshot", action="store_true", help="Serve reads from MDBX only")
+    parser.add_argument("--save-queries", help="Write the generated query corpus (JSONL) to this path")
+    parser.add_argument("--load-queries", help="Replay a recorded JSONL corpus instead of generating one")
+    parser.add_argument("--json", help="Also write the full report as JSON to this path")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in str(args.sizes).split(",") if s.strip()]
+    recorded: dict[int, list[dict]] = {}
+    if args.load_queries:
+        with open(args.load_queries, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    q = json.loads(line)
+                    recorded.setdefault(int(q["size"]), []).append(q)
+
+    reports: list[dict] = []
+    saving = open(args.save_queries, "w", encoding="utf-8") if args.save_queries else contextlib.nullcontext()
+    with tempfile.TemporaryDirectory(prefix="games-bench-") as tmp, saving as saved:
+        for size in sizes:
+            queries = recorded.get(size) if args.load_queries else None
+            if args.load_queries and queries is None:
+                raise SystemExit(f"No recorded queries for catalog size {size}.")
+            if saved is not None and queries is None:
+                queries = build_queries(build_catalog(size, seed=args.seed), args.queries, seed=args.seed)
+                for q in queries:
+                    saved.write(json.dumps({"size": size, **q}, ensure_ascii=False) + "\n")
+            report = run_size(size, queries, args, Path(tmp))
+            _print_report(report)
+            reports.append(report)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(reports, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+# Neither side talks to Telegram, but importing app.services loads the settings, which require a token.
+# The workers inherit it from this process.
+os.environ.setdefault("BOT_TOKEN", "compare")
+
+from scripts.bench_games_search import build_catalog, build_queries, latency_row, quality_row  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+WORKTREE = "WORKTREE"
+
+
+def _checkout(ref: str, dest: Path) -> Path:
+    """Directory whose `app` package is the given git ref (or the working tree itself)."""
+    if ref == WORKTREE:
+        return REPO_ROOT
+    raw = subprocess.check_output(["git", "-C", str(REPO_ROOT), "archive", "--format=tar", ref, "app"])
+    with tarfile.open(fileobj=io.BytesIO(raw)) as tar:
+        tar.extractall(dest)
+    return dest
+
+
+def _run_side(ref: str, tree: Path, workdir: Path, catalog: Path, queries: Path) -> dict:
+    # Each ref runs in its own interpreter, so its modules, singletons and MDBX handles never meet the other's.
+    out = workdir / "result.json"
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(tree), str(REPO_ROOT)])
+    subprocess.check_call(
+        [
+            sys.executable,
+            "-m",
+            "scripts.compare_games_index",
+            "--worker",
+            "--catalog",
+            str(catalog),
+            "--query-file",
+            str(queries),
+            "--out",
+            str(out),
+        ],
+        cwd=workdir,
+        env=env,
+    )
+    result = json.loads(out.read_text(encoding="utf-8"))
+    result["ref"] = ref
+    return result
+
+
+def _worker(args: argparse.Namespace) -> int:
+    from app.services import games as games_module
+
+    games = json.loads(Path(args.catalog).read_text(encoding="utf-8"))
+    queries = json.loads(Path(args.query_file).read_text(encoding="utf-8"))
+    path = Path("games.mdbx").resolve()
+
+    started = time.perf_counter()
+    svc = games_module.GamesService(str(path))
+    svc.rebuild(games)
+    svc.count()
+    build_seconds = time.perf_counter() - started
+
+    # Queries are distinct, so each one is timed once and cold on both sides, whatever caching a ref has.
+    results: dict[str, dict] = {}
+    for q in queries:
+        started = time.perf_counter()
+        items, total = svc.search(q, 0, 20)
+        results[q] = {
+            "seconds": time.perf_counter() - started,
+            "codes": [str(g["code"]) for g in items],
+            "total": total,
+        }
+
+    size = sum(f.stat().st_size for f in path.parent.iterdir() if f.name.startswith(path.name))
+    Path(args.out).write_text(
+        json.dumps(
+            {
+                "schema": getattr(games_module, "MDBX_SCHEMA_VERSION", None),
+                "build_s": build_seconds,
+                "file_mb": size / 1e6,
+                "queries": results,
+            }
+        ),
+        encoding="utf-8",
+    )
+    return 0
+
+
+def _overlap(base: list[str], head: list[str]) -> float:
+    """Share of the base top-20 that head still returns in its top-20."""
+    return len(set(base) & set(head)) / len(base) if base else 1.0
+
+
+def _summarize(side: dict, labeled: list[dict]) -> dict:
+    ranked = [side["queries"][q["query"]]["codes"] for q in labeled]
+    row = latency_row([side["queries"][q["query"]]["seconds"] for q in labeled])
+    row.update(quality_row(ranked, labeled))
+    return row
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare games search quality, latency and index size between two git refs.",
+    )
+    parser.add_argument("--base", default="HEAD", help="Baseline git ref")
+    parser.add_argument("--head", default=WORKTREE, help=f"Candidate git ref ({WORKTREE} = current checkout)")
+    parser.add_argument("--size", type=int, default=10_000, help="Synthetic catalog size")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-recall-drop", type=float, default=0.01, help="Fail if recall@20 drops by more")
+    parser.add_argument("--max-p95-ratio", type=float, default=1.5, help="Fail if head p95 exceeds base p95 times this")
+    parser.add_argument("--show", type=int, default=10, help="How many lost queries and slowdowns to list")
+    parser.add_argument("--json", help="Also write the comparison as JSON to this path")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--catalog", help=argparse.SUPPRESS)
+    parser.add_argument("--query-file", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        return _worker(args)
+
+    games = build_catalog(args.size, seed=args.seed)
+    labeled: list[dict] = []
+    seen: set[str] = set()
+    for q in build_queries(games, args.queries, seed=args.seed):
+        # Prefix completion is served by suggest(), not search(); the gate covers search only.
+        if q["kind"] != "prefix" and q["query"] not in seen:
+            seen.add(q["query"])
+            labeled.append(q)
+
+    with tempfile.TemporaryDirectory(prefix="games-compare-") as tmp:
+        root = Path(tmp)
+        catalog = root / "catalog.json"
+        catalog.write_text(json.dumps(games, ensure_ascii=False), encoding="utf-8")
+        query_file = root / "queries.json"
+        query_file.write_text(json.dumps([q["query"] for q in labeled], ensure_ascii=False), encoding="utf-8")
+
+        sides: dict[str, dict] = {}
+        for name, ref in (("base", args.base), ("head", args.head)):
+            workdir = root / name
+            (workdir / "tree").mkdir(parents=True)
+            tree = _checkout(ref, workdir / "tree")
+            print(f"Building {name} ({ref}) with {len(games)} games...", flush=True)
+            sides[name] = _run_side(ref, tree, workdir, catalog, query_file)
+
+    base, head = sides["base"], sides["head"]
+    summary = {name: _summarize(side, labeled) for name, side in sides.items()}
+    kinds = sorted({q["kind"] for q in labeled})
+    by_kind = {
+        kind: {name: _summarize(side, [q for q in labeled if q["kind"] == kind]) for name, side in sides.items()}
+        for kind in kinds
+    }
+    overlaps = [_overlap(base["queries"][q["query"]]["codes"], head["queries"][q["query"]]["codes"]) for q in labeled]
+
+    print(f"\n{'':<12}{'schema':>8}{'build s':>10}{'file MB':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'recall@20':>11}{'mrr':>7}")
+    for name, side in sides.items():
+        row = summary[name]
+        print(
+            f"{name:<12}{str(side['schema']):>8}{side['build_s']:>10.1f}{side['file_mb']:>10.1f}"
+            f"{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}{row['recall@20']:>11.3f}{row['mrr']:>7.3f}"
+        )
+    print(f"\nTop-20 overlap of head with base: {sum(overlaps) / max(1, len(overlaps)):.3f}")
+    print(f"\n{'kind':<12}{'recall base':>12}{'recall head':>12}{'p95 base':>10}{'p95 head':>10}")
+    for kind, rows in by_kind.items():
+        print(
+            f"{kind:<12}{rows['base']['recall@20']:>12.3f}{rows['head']['recall@20']:>12.3f}"
+            f"{rows['base']['p95_ms']:>10.2f}{rows['head']['p95_ms']:>10.2f}"
+        )
+
+    lost = [
+        q
+        for q in labeled
+        if set(q["expected"]) & set(base["queries"][q["query"]]["codes"])
+        and not set(q["expected"]) & set(head["queries"][q["query"]]["codes"])
+    ]
+    if lost:
+        print(f"\nFound by base but not by head ({len(lost)}):")
+        for q in lost[: args.show]:
+            print(f"  [{q['kind']}] {q['query']!r} -> expected {q['target']}")
+    def slowdown(q: dict) -> float:
+        return head["queries"][q["query"]]["seconds"] - base["queries"][q["query"]]["seconds"]
+
+    slowdowns = sorted((q for q in labeled if slowdown(q) > 0), key=slowdown, reverse=True)
+    print(f"\nSlower on head: {len(slowdowns)} of {len(labeled)} queries")
+    for q in slowdowns[: args.show]:
+        b, h = base["queries"][q["query"]]["seconds"], head["queries"][q["query"]]["seconds"]
+        print(f"  [{q['kind']}] {q['query']!r}: {b * 1000:.1f} -> {h * 1000:.1f} ms")
+
+    failures: list[str] = []
+    recall_drop = summary["base"]["recall@20"] - summary["head"]["recall@20"]
+    if recall_drop > args.max_recall_drop:
+        failures.append(f"recall@20 dropped by {recall_drop:.3f} (allowed {args.max_recall_drop})")
+    if summary["head"]["p95_ms"] > summary["base"]["p95_ms"] * args.max_p95_ratio:
+        failures.append(
+            f"p95 {summary['head']['p95_ms']:.1f} ms exceeds {args.max_p95_ratio}x base {summary['base']['p95_ms']:.1f} ms"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps(
+                {
+                    "base": {"ref": args.base, "schema": base["schema"], "file_mb": base["file_mb"], **summary["base"]},
+                    "head": {"ref": args.head, "schema": head["schema"], "file_mb": head["file_mb"], **summary["head"]},
+                    "kinds": by_kind,
+                    "overlap": sum(overlaps) / max(1, len(overlaps)),
+                    "lost": lost,
+                    "failures": failures,
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+    if failures:
+        print("\nFAIL: " + "; ".join(failures))
+        return 1
+    print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
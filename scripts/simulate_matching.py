@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import os
+import random
+import statistics
+import time
+from pathlib import Path
+
+# The simulation never talks to Telegram, but importing app.services loads the settings, which require a token.
+os.environ.setdefault("BOT_TOKEN", "simulate")
+
+from app.models.search import SearchRequest  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.matching import MatchPool, PoolEntry  # noqa: E402
+
+STRATEGIES = ("greedy", "batch", "greedy+batch")
+# Game popularity is long-tailed: a few modes are in most profiles.
+MODES = [f"game{i}" for i in range(12)]
+MODE_WEIGHTS = [1 / (i + 1) for i in range(len(MODES))]
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def build_arrivals(duration: float, per_minute: float, patience: float, seed: int = 1) -> list[dict]:
+    """Synthetic searches: Poisson arrivals, each with a profile, search criteria and a time to give up."""
+    rnd = random.Random(seed)
+    arrivals: list[dict] = []
+    at = 0.0
+    while True:
+        at += rnd.expovariate(per_minute / 60)
+        if at >= duration:
+            return arrivals
+        language = "ru" if rnd.random() < 0.7 else "en"
+        age = rnd.randint(8, 25)
+        modes = set(rnd.choices(MODES, MODE_WEIGHTS, k=rnd.randint(1, 3)))
+        wanted = [] if rnd.random() < 0.3 else rnd.sample(sorted(modes), min(len(modes), rnd.randint(1, 2)))
+        spread = rnd.randint(1, 4)
+        arrivals.append(
+            {
+                "id": len(arrivals) + 1,
+                "at": at,
+                "gives_up": at + rnd.expovariate(1 / patience),
+                "language": language,
+                "age": age,
+                "modes": sorted(modes),
+                "search_language": None if rnd.random() < 0.4 else language,
+                "min_age": max(8, age - spread),
+                "max_age": age + spread,
+                "search_modes": wanted,
+            }
+        )
+
+
+def _entry(a: dict) -> PoolEntry:
+    user = User(id=a["id"], language=a["language"], age=a["age"], modes=a["modes"])
+    req = SearchRequest(
+        id=a["id"],
+        user_id=a["id"],
+        language=a["search_language"],
+        min_age=a["min_age"],
+        max_age=a["max_age"],
+        modes=a["search_modes"],
+    )
+    return PoolEntry(req, user)
+
+
+def simulate(arrivals: list[dict], strategy: str, tick: float, duration: float) -> dict:
+    """Replay arrivals against MatchPool the way MatchingService uses it and collect wait times."""
+    greedy = strategy in ("greedy", "greedy+batch")
+    batch = strategy in ("batch", "greedy+batch")
+    pool = MatchPool()
+    arrived: dict[int, float] = {}
+    waits: list[float] = []
+    shared: list[int] = []
+    age_gaps: list[int] = []
+    plan_ms: list[float] = []
+    abandoned = 0
+
+    def pair(a: PoolEntry, b: PoolEntry, now: float) -> None:
+        for entry in (a, b):
+            pool.discard(entry.request_id)
+            waits.append(now - arrived.pop(entry.request_id))
+        shared.append(len(a.modes & b.user_modes) + len(b.modes & a.user_modes))
+        age_gaps.append(abs(a.user_age - b.user_age))
+
+    # Events sort by time; at equal times arrivals come before give-ups and batch ticks.
+    events: list[tuple[float, int, int]] = []
+    for a in arrivals:
+        heapq.heappush(events, (a["at"], 0, a["id"]))
+        heapq.heappush(events, (a["gives_up"], 1, a["id"]))
+    if batch:
+        t = tick
+        while t < duration:
+            heapq.heappush(events, (t, 2, 0))
+            t += tick
+    by_id = {a["id"]: a for a in arrivals}
+
+    while events:
+        now, kind, request_id = heapq.heappop(events)
+        if kind == 0:
+            me = _entry(by_id[request_id])
+            arrived[request_id] = now
+            pool.add(me)
+            if greedy:
+                found = pool.candidates(me)
+                if found:
+                    pair(me, found[0], now)
+        elif kind == 1:
+            if request_id in arrived:
+                pool.discard(request_id)
+                del arrived[request_id]
+                abandoned += 1
+        else:
+            started = time.perf_counter()
+            plan = pool.plan({rid: now - at for rid, at in arrived.items()})
+            plan_ms.append((time.perf_counter() - started) * 1000)
+            for a, b in plan:
+                pair(a, b, now)
+
+    matched = len(waits)
+    return {
+        "strategy": strategy,
+        "arrivals": len(arrivals),
+        "pairs": matched // 2,
+        "matched_share": matched / max(1, len(arrivals)),
+        "abandoned": abandoned,
+        "wait_p50_s": percentile(waits, 50),
+        "wait_p95_s": percentile(waits, 95),
+        "wait_mean_s": statistics.fmean(waits) if waits else 0.0,
+        "shared_modes": statistics.fmean(shared) if shared else 0.0,
+        "age_gap": statistics.fmean(age_gaps) if age_gaps else 0.0,
+        "plan_ms_p95": percentile(plan_ms, 95),
+        "plan_ms_max": max(plan_ms, default=0.0),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Simulate search matching offline: greedy on enqueue vs periodic max-weight batches.",
+    )
+    parser.add_argument("--duration", type=float, default=4 * 3600, help="Simulated seconds")
+    parser.add_argument("--rate", type=float, default=20, help="New searches per minute")
+    parser.add_argument("--patience", type=float, default=600, help="Mean seconds before a user cancels")
+    parser.add_argument("--tick", type=float, default=30, help="Batch interval, seconds")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    arrivals = build_arrivals(args.duration, args.rate, args.patience, seed=args.seed)
+    results = [
+        simulate(arrivals, strategy.strip(), args.tick, args.duration)
+        for strategy in args.strategies.split(",")
+        if strategy.strip()
+    ]
+
+    print(
+        f"{len(arrivals)} searches over {args.duration / 3600:.1f}h, patience {args.patience:.0f}s, tick {args.tick:.0f}s\n"
+    )
+    print(
+        f"{'strategy':<14}{'pairs':>7}{'matched':>9}{'gave up':>9}{'wait p50':>10}{'wait p95':>10}"
+        f"{'shared':>8}{'age gap':>9}{'plan p95 ms':>13}"
+    )
+    for row in results:
+        print(
+            f"{row['strategy']:<14}{row['pairs']:>7}{row['matched_share']:>9.1%}{row['abandoned']:>9}"
+            f"{row['wait_p50_s']:>10.1f}{row['wait_p95_s']:>10.1f}{row['shared_modes']:>8.2f}{row['age_gap']:>9.2f}"
+            f"{row['plan_ms_p95']:>13.2f}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,6 +5,7 @@ import json
 import re
 import time
 from pathlib import Path
+from typing import Iterable, Iterator
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
@@ -110,11 +111,18 @@ def _http_get_json(url: str, headers: dict[str, str], timeout: int = 20, retries
     raise RuntimeError(f"Failed to fetch {url}: {last_error}")
 
 
-def _chunks(items: list[str], size: int) -> list[list[str]]:
-    return [items[i : i + size] for i in range(0, len(items), size)]
+def _batched(items: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
-def _fetch_names(universe_ids: list[str], accept_language: str, timeout: int = 20, retries: int = 20) -> dict[str, str]:
+def _fetch_games(universe_ids: list[str], accept_language: str, timeout: int = 20, retries: int = 20) -> dict[str, dict]:
     params = {"universeIds": ",".join(universe_ids)}
     url = f"{GAMES_BASE}/v1/games?{urlencode(params)}"
     payload = _http_get_json(
@@ -128,18 +136,33 @@ def _fetch_names(universe_ids: list[str], accept_language: str, timeout: int = 2
     )
     if not isinstance(payload, dict):
         return {}
-    out: dict[str, str] = {}
+    out: dict[str, dict] = {}
     for item in payload.get("data") or []:
         if not isinstance(item, dict):
             continue
         uid = item.get("id")
-        name = item.get("name")
-        if uid is None or not name:
+        if uid is None:
             continue
-        out[str(uid)] = str(name)
+        out[str(uid)] = item
     return out
 
 
+def _fetch_names(universe_ids: list[str], accept_language: str, timeout: int = 20, retries: int = 20) -> dict[str, str]:
+    items = _fetch_games(universe_ids, accept_language=accept_language, timeout=timeout, retries=retries)
+    return {uid: str(item["name"]) for uid, item in items.items() if item.get("name")}
+
+
+def _update_players_only(svc: GamesService, batch_size: int, args: argparse.Namespace) -> int:
+    changed = 0
+    for chunk in _batched(svc.iter_games(batch_size=batch_size), batch_size):
+        codes = [str(g.get("code") or "") for g in chunk if str(g.get("code") or "")]
+        items = _fetch_games(codes, accept_language=str(args.en), timeout=int(args.timeout), retries=int(args.retries))
+        counts = {uid: int(item.get("playing") or 0) for uid, item in items.items()}
+        changed += svc.update_players(counts)
+        time.sleep(max(0.0, float(args.sleep)))
+    return changed
+
+
 def _preserve_case(src: str, replacement: str) -> str:
     if not src:
         return replacement
@@ -191,6 +214,12 @@ def main() -> int:
     parser.add_argument("--ru", default="ru-RU", help="Accept-Language for Russian")
     parser.add_argument("--update-en", action="store_true", help="Also refresh name_en (slower)")
     parser.add_argument("--en", default="en-US", help="Accept-Language for English (used with --update-en)")
+    parser.add_argument("--update-players", action="store_true", help="Also refresh playerCount from the API")
+    parser.add_argument(
+        "--players-only",
+        action="store_true",
+        help="Only refresh playerCount, updating games in place without a full reimport.",
+    )
     parser.add_argument(
         "--rusify-latin",
         action="store_true",
@@ -200,47 +229,61 @@ def main() -> int:
 
     batch_size = max(1, min(int(args.batch_size), MAX_BATCH_SIZE))
     svc = GamesService(str(args.mdbx))
-    games = svc.list()
-    if not games:
+    if not svc.count():
         raise SystemExit("MDBX is empty; populate games first.")
 
-    codes = [str(g.get("code") or "") for g in games if str(g.get("code") or "")]
-    by_code = {str(g.get("code") or ""): g for g in games if str(g.get("code") or "")}
+    if args.players_only:
+        changed = _update_players_only(svc, batch_size, args)
+        print(f"Updated playerCount for {changed}/{svc.count()} games.")
+        return 0
 
     limit = max(0, int(args.limit or 0))
-    if limit:
-        codes = codes[:limit]
-    total = len(codes)
-    ru_done = 0
-    en_done = 0
-
-    for chunk in _chunks(codes, batch_size):
-        names_ru = _fetch_names(chunk, accept_language=str(args.ru), timeout=int(args.timeout), retries=int(args.retries))
-        for code, name in names_ru.items():
-            g = by_code.get(code)
-            if g is None:
+    total = min(svc.count(), limit) if limit else svc.count()
+    stats = {"ru": 0, "en": 0}
+
+    def updated_games() -> Iterator[dict]:
+        seen = 0
+        for chunk in _batched(svc.iter_games(batch_size=batch_size), batch_size):
+            if limit and seen >= limit:
+                yield from chunk
                 continue
-            g["name_ru"] = _rusify_mixed_ru_name(name) if args.rusify_latin else name
-            ru_done += 1
-        time.sleep(max(0.0, float(args.sleep)))
+            todo = chunk[: limit - seen] if limit else chunk
+            seen += len(todo)
+            by_code = {str(g.get("code") or ""): g for g in todo if str(g.get("code") or "")}
+            codes = list(by_code)
 
-    if args.update_en:
-        for chunk in _chunks(codes, batch_size):
-            names_en = _fetch_names(
-                chunk,
-                accept_language=str(args.en),
-                timeout=int(args.timeout),
-                retries=int(args.retries),
-            )
-            for code, name in names_en.items():
+            items_ru = _fetch_games(codes, accept_language=str(args.ru), timeout=int(args.timeout), retries=int(args.retries))
+            for code, item in items_ru.items():
                 g = by_code.get(code)
                 if g is None:
                     continue
-                g["name_en"] = name
-                en_done += 1
+                if args.update_players:
+                    g["playerCount"] = int(item.get("playing") or 0)
+                if not item.get("name"):
+                    continue
+                name = str(item["name"])
+                g["name_ru"] = _rusify_mixed_ru_name(name) if args.rusify_latin else name
+                stats["ru"] += 1
             time.sleep(max(0.0, float(args.sleep)))
 
-    svc.rebuild(games)
+            if args.update_en:
+                names_en = _fetch_names(
+                    codes,
+                    accept_language=str(args.en),
+                    timeout=int(args.timeout),
+                    retries=int(args.retries),
+                )
+                for code, name in names_en.items():
+                    g = by_code.get(code)
+                    if g is None:
+                        continue
+                    g["name_en"] = name
+                    stats["en"] += 1
+                time.sleep(max(0.0, float(args.sleep)))
+            yield from chunk
+
+    svc.import_stream(updated_games())
+    ru_done, en_done = stats["ru"], stats["en"]
     print(f"Updated {svc.count()} games. name_ru={ru_done}/{total}, name_en={'skipped' if not args.update_en else f'{en_done}/{total}'}")
     return 0
 